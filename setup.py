@@ -40,6 +40,11 @@ setuptools.setup(
     python_requires='>=3.6',
     extras_require={
         'dev': ['check-manifest'],
+        'ml': ['scikit-learn'],
+        'parquet': ['pyarrow'],
+        'fast-excel': ['python-calamine'],
+        'yaml': ['PyYAML'],
+        'excel': ['xlsxwriter'],
         # 'test': ['coverage'],
     },
  
@@ -4,8 +4,25 @@ from .module1 import *
 from .claim_processor import *
 from .pdf_generator import *
 from .pdf_generator2 import *
+from .pdf_render_pool import *
 from .df_styler import *
+from .html_table import *
 from .periodicity_processor import *
 from .pdf_tools import *
+from .excel_export import *
 from .excel_merger import *
 from .pdf_ocr import *
+from .rejection_categorizer import *
+from .reason_matcher import *
+from .estmst_analyzer import *
+from .anomaly_detector import *
+from .estmst_store import *
+from .visualization import *
+from .source_registry import *
+from .group_dimension import *
+from .listing_engine import *
+from .report_plan import *
+from .worklist_fanout import *
+from .daily_reporter import *
+from .performance_analyzer import *
+from .claim_lifecycle import *
@@ -0,0 +1,113 @@
+import warnings
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+"""
+Example usecase:
+detector = AnomalyDetector(window=12, threshold=3.5)
+
+cube = EstmstAnalyzer().to_cube(df_estmst)
+flags = detector.detect(cube)                                   # EST ID, date, metric, value, median, zscore, direction
+
+dall = PeriodicityProcessor.read_periodicity('2024.csv', '2023-24')
+detector.monthwise_formwise_claims(dall)
+detector.claim_count_anomalies(dall, 'GROUP_ID')
+"""
+class AnomalyDetector:
+    """Flags sudden drops and spikes with rolling robust z-scores.
+
+    Each month is compared with the median and MAD of the `window` months
+    before it, so a spike does not hide itself. The spread is floored at
+    `min_scale_ratio` of the median (and at least 1) so flat series do not
+    turn every small change into an anomaly.
+    """
+
+    def __init__(self, window=12, threshold=3.5, min_periods=None, min_scale_ratio=0.05, chunk_size=2000):
+        self.window = window
+        self.threshold = threshold
+        self.min_periods = min_periods if min_periods is not None else max(window // 2, 1)
+        self.min_scale_ratio = min_scale_ratio
+        self.chunk_size = chunk_size
+
+    def _rolling_scores(self, values):
+        """(zscores, median) along axis 1 of a (series, month[, metric]) array."""
+        values = np.asarray(values, dtype=np.float64)
+        zscores = np.full(values.shape, np.nan)
+        median = np.full(values.shape, np.nan)
+        if values.shape[1] <= self.window:
+            return zscores, median
+        # nanmedian copies its input, so series go through in chunks to bound the
+        # window temporaries at chunk_size x months x window
+        for start in range(0, values.shape[0], self.chunk_size):
+            rows = slice(start, start + self.chunk_size)
+            zscores[rows, self.window:], median[rows, self.window:] = self._window_scores(values[rows])
+        return zscores, median
+
+    def _window_scores(self, values):
+        """(zscores, median) of months window.. for one chunk of series."""
+        # windows[:, i] holds months i .. i+window-1 and is the history of month i+window
+        windows = sliding_window_view(values[:, :-1], self.window, axis=1)
+        observed = (~np.isnan(windows)).sum(axis=-1)
+        median_fn = np.nanmedian if (observed < self.window).any() else np.median
+        with warnings.catch_warnings():
+            # all-NaN windows (establishment not yet registered) stay NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            history_median = median_fn(windows, axis=-1)
+            mad = median_fn(np.abs(windows - history_median[..., None]), axis=-1)
+        scale = np.maximum(1.4826 * mad, np.maximum(self.min_scale_ratio * np.abs(history_median), 1.0))
+        current = values[:, self.window:]
+        return np.where(observed >= self.min_periods, (current - history_median) / scale, np.nan), history_median
+
+    def robust_zscores(self, values):
+        """Rolling robust z-scores along axis 1 of a (series, month[, metric]) array."""
+        return self._rolling_scores(values)[0]
+
+    def detect(self, cube, metrics=None):
+        """Long frame of every (EST, month, metric) whose |z| exceeds the threshold."""
+        metrics = metrics or cube.metrics
+        values = cube.values[..., [cube.metric_index[m] for m in metrics]]
+        zscores, median = self._rolling_scores(values)
+        with np.errstate(invalid='ignore'):
+            est, month, metric = np.nonzero(np.abs(zscores) > self.threshold)
+        z = zscores[est, month, metric]
+        return pd.DataFrame({
+            'EST ID': cube.est_ids[est],
+            'date': cube.months[month],
+            'metric': np.asarray(metrics, dtype=object)[metric],
+            'value': values[est, month, metric],
+            'median': median[est, month, metric],
+            'zscore': z,
+            'direction': np.where(z < 0, 'drop', 'spike'),
+        })
+
+    @staticmethod
+    def monthwise_claims(df, column=None, month_column='month', value='CLAIM_ID'):
+        """Claim counts per month, optionally split by `column` (FORM_NAME, GROUP_ID, EST, ...)."""
+        if column is None:
+            return df.groupby(month_column, observed=True)[value].count().to_frame('claims')
+        return pd.pivot_table(df, values=value, index=[month_column], columns=[column],
+                              margins=True, aggfunc='count', fill_value=0, observed=True)
+
+    def monthwise_formwise_claims(self, df, month_column='month'):
+        return self.monthwise_claims(df, 'FORM_NAME', month_column)
+
+    def monthwise_groupwise_claims(self, df, month_column='month'):
+        return self.monthwise_claims(df, 'GROUP_ID', month_column)
+
+    def claim_count_anomalies(self, df, column, month_column='ym'):
+        """Flag months whose claim count for a `column` value departs from its own history."""
+        counts = pd.crosstab(df[column], df[month_column]).sort_index(axis=1)
+        zscores = self.robust_zscores(counts.to_numpy())
+        with np.errstate(invalid='ignore'):
+            row, month = np.nonzero(np.abs(zscores) > self.threshold)
+        z = zscores[row, month]
+        return pd.DataFrame({
+            column: counts.index[row],
+            month_column: counts.columns[month],
+            'claims': counts.to_numpy()[row, month],
+            'zscore': z,
+            'direction': np.where(z < 0, 'drop', 'spike'),
+        })
+
@@ -0,0 +1,172 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from .daily_reporter import STATUS_BINS
+from .performance_analyzer import SnapshotComparer, read_claim_snapshot, sorted_lookup
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+# lifecycle stage of each report bin; statuses are binned by the same STATUS_BINS as the daily report
+BIN_STAGES = {
+    'DA(Includes NTE)':     'DA',
+    'Approver':             'Approver',
+    'Rejection':            'Rejection',
+    'Dispatch/Cash/Scroll': 'Cash',
+    'Pension':              'Pension',
+}
+STAGE_STATUSES = {stage: [status for status, status_bin in STATUS_BINS.items() if BIN_STAGES[status_bin] == stage]
+                  for stage in BIN_STAGES.values()}
+STAGES = list(STAGE_STATUSES) + ['Other']
+EVENT_COLUMNS = ['CLAIM ID', 'stage', 'entered', 'exited', 'GROUP ID', 'TASK ID']
+
+
+def stage_codes(statuses):
+    """Index into STAGES of each portal status; statuses not listed are 'Other'."""
+    lookup = {status: code for code, stage in enumerate(STAGE_STATUSES) for status in STAGE_STATUSES[stage]}
+    return statuses.map(lookup).fillna(len(STAGES) - 1).to_numpy(dtype=np.int8)
+
+
+def _as_date(date):
+    if isinstance(date, str):
+        return pd.to_datetime(date.replace('-', '_'), format='%Y_%m_%d')
+    return pd.Timestamp(date).normalize()
+
+
+"""
+Example usecase:
+lifecycle = ClaimLifecycle.load('reports/lifecycle.parquet')      # or ClaimLifecycle()
+lifecycle.update('reports/')                                      # only days after lifecycle.last_date
+lifecycle.events                                                   # CLAIM ID, stage, entered, exited, ...
+lifecycle.dwell_stats(by=['GROUP ID'])                             # days per stage per group
+lifecycle.save('reports/lifecycle.parquet')
+"""
+class ClaimLifecycle:
+    """Stage stints (CLAIM ID, stage, entered, exited) from ordered daily claim snapshots.
+
+    A stint starts on the first snapshot a claim is seen at a stage (DA,
+    Approver, Rejection, Cash, Pension or Other) and ends on the first
+    snapshot where it has moved on or is gone. Open stints are kept sorted
+    by CLAIM ID, so each new day is one sort-merge against that day's
+    snapshot; earlier days are never revisited.
+    """
+
+    def __init__(self):
+        self._open = self._empty()
+        self._closed = []
+        self._events = None
+        self.first_date = None
+        self.last_date = None
+
+    @staticmethod
+    def _empty():
+        return pd.DataFrame({'CLAIM ID': np.array([], dtype=np.int64), 'stage': np.array([], dtype=np.int8),
+                             'entered': pd.to_datetime([]), 'GROUP ID': [], 'TASK ID': []})
+
+    def add_snapshot(self, date, snapshot):
+        """Advance the log to `date` with that day's claims (CLAIM ID, STATUS, GROUP ID, TASK ID)."""
+        date = _as_date(date)
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"Snapshot {date.date()} is not after the last one ({self.last_date.date()})")
+        if not snapshot['CLAIM ID'].is_monotonic_increasing or not snapshot['CLAIM ID'].is_unique:
+            snapshot = snapshot.sort_values('CLAIM ID', kind='stable').drop_duplicates('CLAIM ID')
+        ids = snapshot['CLAIM ID'].to_numpy(dtype=np.int64)
+        stages = stage_codes(snapshot['STATUS'])
+        open_ids = self._open['CLAIM ID'].to_numpy()
+
+        positions, found = sorted_lookup(open_ids, ids)
+        continuing = found.copy()
+        continuing[found] = stages[positions[found]] == self._open['stage'].to_numpy()[found]
+        closed = self._open[~continuing].assign(exited=date)
+        if len(closed):
+            self._closed.append(closed[EVENT_COLUMNS])
+        carried = np.zeros(len(ids), dtype=bool)
+        carried[positions[continuing]] = True
+        entering = snapshot[~carried]
+        opened = pd.DataFrame({'CLAIM ID': ids[~carried], 'stage': stages[~carried], 'entered': date})
+        for column in ['GROUP ID', 'TASK ID']:
+            opened[column] = entering[column].to_numpy() if column in entering.columns else np.nan
+        # both parts are sorted by CLAIM ID, so the stable sort is a linear merge of two runs
+        parts = [part for part in (self._open[continuing], opened) if len(part)]
+        merged = pd.concat(parts, ignore_index=True) if parts else self._empty()
+        self._open = merged.iloc[np.argsort(merged['CLAIM ID'].to_numpy(), kind='stable')].reset_index(drop=True)
+        if self.first_date is None:
+            self.first_date = date
+        self.last_date = date
+        self._events = None
+        return len(closed), len(opened)
+
+    def update(self, directory_path, fname='claim.csv'):
+        """Add every dated snapshot folder in directory_path newer than last_date, in order."""
+        comparer = SnapshotComparer(directory_path, statuses=None)
+        added = []
+        for date in comparer.dates():
+            if self.last_date is None or _as_date(date) > self.last_date:
+                path = os.path.join(directory_path, date, fname)
+                closed, opened = self.add_snapshot(date, read_claim_snapshot(path))
+                print(f"{date}: {opened} stints started, {closed} ended")
+                added.append(date)
+        return added
+
+    @property
+    def events(self):
+        """All stints, open ones with exited NaT, stage as a categorical."""
+        if self._events is None:
+            open_events = self._open.assign(exited=pd.NaT)[EVENT_COLUMNS]
+            frames = [frame for frame in self._closed if len(frame)] + [open_events]
+            events = pd.concat(frames, ignore_index=True)
+            self._closed = [events[events['exited'].notna()]]
+            events['stage'] = pd.Categorical.from_codes(events['stage'].to_numpy(dtype=np.int8), STAGES)
+            self._events = events
+        return self._events
+
+    def dwell_times(self, complete_only=True):
+        """events with 'days' spent in the stage; open stints count up to last_date.
+
+        complete_only drops open stints and those already running on the
+        first snapshot, whose true start is unknown.
+        """
+        events = self.events
+        if complete_only:
+            events = events[events['exited'].notna() & (events['entered'] > self.first_date)]
+        exited = events['exited'].fillna(self.last_date)
+        return events.assign(days=(exited - events['entered']).dt.days)
+
+    def dwell_stats(self, by=('GROUP ID',), complete_only=True):
+        """Days per stint per stage and `by` columns: count, mean, median, p90, max."""
+        dwell = self.dwell_times(complete_only)
+        grouped = dwell.groupby(['stage'] + list(by), observed=True)['days']
+        stats = grouped.agg(['count', 'mean', 'median', 'max'])
+        stats.insert(3, 'p90', grouped.quantile(0.9))
+        return stats
+
+    def save(self, path):
+        """Events as Parquet at path, with first/last date in path + '.json'."""
+        if pyarrow is None:
+            raise ImportError("Saving the lifecycle needs pyarrow. Install it with: pip install epftools[parquet]")
+        events = self.events.assign(stage=self.events['stage'].cat.codes)
+        events.to_parquet(path, index=False)
+        with open(path + '.json', 'w') as f:
+            json.dump({'first_date': str(self.first_date.date()) if self.first_date is not None else None,
+                       'last_date': str(self.last_date.date()) if self.last_date is not None else None}, f)
+
+    @classmethod
+    def load(cls, path):
+        """Lifecycle saved with save(); a new, empty one when path does not exist yet."""
+        lifecycle = cls()
+        if not os.path.exists(path):
+            return lifecycle
+        events = pd.read_parquet(path)
+        with open(path + '.json') as f:
+            meta = json.load(f)
+        is_open = events['exited'].isna()
+        lifecycle._closed = [events[~is_open]]
+        lifecycle._open = events[is_open].drop(columns='exited').sort_values('CLAIM ID').reset_index(drop=True)
+        lifecycle.first_date = _as_date(meta['first_date']) if meta['first_date'] else None
+        lifecycle.last_date = _as_date(meta['last_date']) if meta['last_date'] else None
+        return lifecycle
@@ -0,0 +1,270 @@
+import io
+import os
+import time
+import hashlib
+import importlib.util
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pdfkit
+
+from .source_registry import SourceRegistry
+from .group_dimension import GroupDimension
+from .report_plan import ReportPlan
+from .df_styler import DataFrameStyler
+from .excel_export import ExcelStreamWriter, sheet_name
+from .html_table import HtmlTableWriter
+from .pdf_generator2 import pdfkit_configuration
+from .pdf_render_pool import PDFRenderPool
+from .worklist_fanout import WorklistFanout
+
+
+STATUS_BINS = {
+    'Pending at DA'                                   : 'DA(Includes NTE)',
+    'Pending at DA Accounts'                          : 'DA(Includes NTE)',
+    'Pending at DA Accounts [Rejection]'              : 'DA(Includes NTE)',
+    'Pending at DA Accounts [EDIT]'                   : 'DA(Includes NTE)',
+    'Pending at Dispatch'                             : 'Dispatch/Cash/Scroll',
+    'Pending at DA SCROLL'                            : 'Dispatch/Cash/Scroll',
+    'Pending at CHEQUE Alottment/Printing'            : 'Dispatch/Cash/Scroll',
+    'Pending [ Referred to Other Office ]'            : 'Dispatch/Cash/Scroll',
+    'Pending at SS/AO/AC Accounts [Rejection]'        : 'Rejection',
+    'Pending at SS/AO/AC Accounts'                    : 'Approver',
+    'Pending [ Approver Pending ]'                    : 'Approver',
+    'Pending at DA Pension [Worksheet Generation]'    : 'Pension',
+    'Pending at DA Pension [PPO Generation]'          : 'Pension',
+    'Pending at DA Pension [SC worksheet generation]' : 'Pension',
+    'Pending at E-Sign'                               : 'Pension',
+    'Pending at AC Pension [Worksheet Generation]'    : 'Pension',
+    'Pending at AC Pension [PPO Generation]'          : 'Pension',
+}
+
+# calamine (pip install python-calamine) parses xlsx in Rust, several times faster than openpyxl
+EXCEL_ENGINE = 'calamine' if importlib.util.find_spec('python_calamine') else None
+
+def read_excel_auto_header(path, required_column, max_scan=10, **kwargs):
+    """read_excel with the header on whichever of the first rows holds `required_column`.
+
+    Portal downloads carry a title row above the header, re-saved sheets do not.
+    """
+    kwargs.setdefault('engine', EXCEL_ENGINE)
+    head = pd.read_excel(path, header=None, nrows=max_scan, **kwargs)
+    matches = head.apply(lambda row: row.astype(str).str.strip().eq(required_column).any(), axis=1)
+    if not matches.any():
+        raise ValueError(f"Column '{required_column}' not found in the first {max_scan} rows of {path}")
+    return pd.read_excel(path, skiprows=int(np.flatnonzero(matches.to_numpy())[0]), **kwargs)
+
+
+def _digits(values, start=None, stop=None):
+    """Integer taken from a slice of each value's digits, NA where it is not numeric."""
+    if pd.api.types.is_numeric_dtype(values):
+        values = values.astype('Int64')
+    text = values.astype(str).str.strip().str[start:stop]
+    return pd.to_numeric(text, errors='coerce').astype('Int64')
+
+
+def _attach_groups(df, groups):
+    """Officer (and any other group attributes) from the GROUP ID column."""
+    return (groups or GroupDimension.default()).attach(df)
+
+
+def load_claim_csv(path, task_column='TASK ID', id_column='CLAIM ID', groups=None):
+    """Claim.csv / tin.csv as (CLAIM ID, TASK ID, PENDING DAYS, STATUS, PORTAL STATUS, GROUP ID, Officer).
+
+    STATUS is the binned status (DA(Includes NTE), Approver, ...), PORTAL STATUS the original text.
+    """
+    df = pd.read_csv(path, usecols=[id_column, task_column, 'PENDING DAYS', 'STATUS'])
+    df = df.rename(columns={id_column: 'CLAIM ID', task_column: 'TASK ID', 'STATUS': 'PORTAL STATUS'})
+    df['TASK ID'] = pd.to_numeric(df['TASK ID'], errors='coerce').fillna(10100).astype(np.int64)
+    df['GROUP ID'] = _digits(df['TASK ID'], stop=3)
+    df['STATUS'] = df['PORTAL STATUS'].map(STATUS_BINS).fillna(df['PORTAL STATUS'])
+    return _attach_groups(df[['CLAIM ID', 'TASK ID', 'PENDING DAYS', 'STATUS', 'PORTAL STATUS', 'GROUP ID']], groups)
+
+
+def load_pendency_excel(path, groups=None):
+    """dsc.xlsx / esign.xlsx as (EST ID, Pending With, desig, TASK ID, GROUP ID, PENDING DAYS, Officer)."""
+    df = read_excel_auto_header(path, 'EST ID')
+    df = df.rename(columns={'ACC TASK ID': 'Pending With', 'PENDING AT (DESIG)': 'desig'})
+    df['desig'] = df['desig'].replace({'RPFC': 'RPFC/APFC', 'APFC': 'RPFC/APFC'})
+    df['TASK ID'] = _digits(df['Pending With'], start=-5)
+    df['GROUP ID'] = _digits(df['TASK ID'], stop=3)
+    columns = ['EST ID', 'Pending With', 'desig', 'TASK ID', 'GROUP ID']
+    return _attach_groups(df[columns + [c for c in ['PENDING DAYS'] if c in df.columns]], groups)
+
+
+def load_change_excel(path, groups=None):
+    """online/primary/others.xlsx as (MEMBER ID, PENDING DAYS, A/C GROUP, desig, GROUP ID, TASK ID, Officer)."""
+    df = read_excel_auto_header(path, 'MEMBER ID')
+    df = df[['MEMBER ID', 'PENDING DAYS', 'A/C GROUP', 'DESIGNATION']].rename(columns={'DESIGNATION': 'desig'})
+    df['GROUP ID'] = _digits(df['A/C GROUP'], start=-3).fillna(100)
+    df['TASK ID'] = df['GROUP ID'].astype(str) + '00-sum'
+    return _attach_groups(df, groups)
+
+
+# bump when the loaders' output columns or their derivation change, so Parquet sidecars are rebuilt
+LOADER_SCHEMA_VERSION = 1
+
+
+def _loader_cache_version():
+    """Sidecar key part of the loaders above: schema version, STATUS_BINS and the default group table."""
+    bins = hashlib.blake2b(repr(sorted(STATUS_BINS.items())).encode(), digest_size=8).hexdigest()
+    return f"{LOADER_SCHEMA_VERSION}:{bins}:{GroupDimension.default()!r}"
+
+
+load_claim_csv.cache_version = _loader_cache_version
+load_pendency_excel.cache_version = _loader_cache_version
+load_change_excel.cache_version = _loader_cache_version
+
+
+"""
+Example usecase:
+reporter = DailyReporter('downloads/2023_04_05', 'downloads/template.html',
+                         wkhtmltopdf_path=r'C:\\Program Files\\wkhtmltopdf\\bin\\wkhtmltopdf.exe')
+reporter.generate_daily_report()        # downloads/2023_04_05/report_<date>.pdf and listing_<date>.xlsx
+reporter.df_claim_pivot4.head()
+"""
+class DailyReporter:
+    # attribute -> (file name, loader, loader kwargs)
+    SOURCES = {
+        'claim':   ('Claim.csv',    load_claim_csv, {'task_column': 'TASK ID', 'id_column': 'CLAIM ID'}),
+        'tin':     ('tin.csv',      load_claim_csv, {'task_column': 'ACC TASK ID', 'id_column': 'TRAN CLAIM ID'}),
+        'dsc':     ('dsc.xlsx',     load_pendency_excel, {}),
+        'esign':   ('esign.xlsx',   load_pendency_excel, {}),
+        'online':  ('online.xlsx',  load_change_excel, {}),
+        'primary': ('primary.xlsx', load_change_excel, {}),
+        'others':  ('others.xlsx',  load_change_excel, {}),
+    }
+
+    # table specs compiled by ReportPlan; a YAML file with the same fields can be passed instead
+    REPORT = [
+        {'name': 'df_claim_pivot1', 'title': 'Claim Pendency', 'source': 'claim', 'bins': 2,
+         'index': ['cat'], 'highlight': 5000},
+        {'name': 'df_claim_pivot2', 'title': 'Claim Pendency (at each level)', 'source': 'claim', 'min_days': 0,
+         'index': ['STATUS'], 'highlight': 5000},
+        {'name': 'df_claim_pivot3', 'title': 'Claim Pendency (at each level >20days)', 'source': 'claim',
+         'min_days': 20, 'index': ['STATUS'], 'highlight': 5},
+        {'name': 'df_tin_pivot1', 'title': 'Transfer In Pendency', 'source': 'tin', 'bins': 5,
+         'index': ['cat'], 'highlight': 1000},
+        {'name': 'df_tin_pivot2', 'title': 'Transfer In (at each level)', 'source': 'tin', 'min_days': 0,
+         'index': ['STATUS'], 'highlight': 1000},
+        {'name': 'df_tin_pivot3', 'title': 'Transfer In (at each level >20days)', 'source': 'tin', 'min_days': 20,
+         'index': ['STATUS'], 'highlight': 1000, 'page_break': True},
+        {'name': 'df_online_pivot', 'title': 'Online Change Pendency', 'source': 'online', 'bins': 2,
+         'index': ['cat', 'desig'], 'highlight': 50},
+        {'name': 'df_primary_pivot', 'title': 'Primary Change Pendency', 'source': 'primary', 'bins': 2,
+         'index': ['cat', 'desig'], 'highlight': 50},
+        {'name': 'df_others_pivot', 'title': 'Other Change Pendency', 'source': 'others', 'bins': 2,
+         'index': ['cat', 'desig'], 'highlight': 10},
+        {'name': 'df_dsc_pivot', 'title': 'DSC Pendency', 'source': 'dsc', 'bins': 2,
+         'index': ['cat', 'desig'], 'highlight': 50},
+        {'name': 'df_esign_pivot', 'title': 'E-Sign Pendency', 'source': 'esign', 'bins': 2,
+         'index': ['cat', 'desig'], 'highlight': 50, 'page_break': True},
+        {'name': 'df_claim_pivot4', 'title': 'DA wise Pendency(Pending at DA or NTE)', 'source': 'claim',
+         'min_days': 0, 'status': ['DA(Includes NTE)'], 'bins': 4, 'index': ['GROUP ID', 'TASK ID'],
+         'columns': ['cat'], 'highlight': {'top': 10, 'column': '<=10 Days'}},
+        {'name': 'df_tin_pivot4', 'title': 'DA wise NEFT Transfer in Pendency', 'source': 'tin', 'min_days': 20,
+         'status': ['DA(Includes NTE)', 'Approver'], 'bins': 5, 'index': ['GROUP ID', 'TASK ID'],
+         'columns': ['STATUS', 'cat'], 'highlight': 20},
+    ]
+
+    def __init__(self, download_dir, template_path, wkhtmltopdf_path=None, max_workers=None, use_cache=True,
+                 report=None, groups=None):
+        self.download_dir = download_dir
+        self.template_path = template_path
+        self.wkhtmltopdf_path = wkhtmltopdf_path
+        self.max_workers = max_workers
+        # normalized xlsx sources are kept as Parquet sidecars in TEMP for re-runs
+        self.cache_dir = os.path.join(download_dir, "TEMP") if use_cache else None
+        self.classes = 'table table-sm table-bordered border-primary d-print-table fs-6'
+        self.options = {
+            'page-size': 'A4',
+            'margin-top': '0.2in',
+            'margin-right': '0.2in',
+            'margin-bottom': '0.2in',
+            'margin-left': '0.2in'
+        }
+        if isinstance(report, str):
+            self.plan = ReportPlan.from_yaml(report)
+        else:
+            self.plan = ReportPlan(report or self.REPORT)
+        # GROUP ID -> Officer (and section/zone) table; a CSV/YAML path or a GroupDimension
+        self.groups = GroupDimension.from_file(groups) if isinstance(groups, str) else groups
+        self.registry = SourceRegistry(cache_dir=self.cache_dir)
+        for name, (filename, loader, kwargs) in self.SOURCES.items():
+            if self.groups is not None:
+                kwargs = {**kwargs, 'groups': self.groups}
+            self.registry.register(name, os.path.join(download_dir, filename), loader, **kwargs)
+            setattr(self, f'df_{name}', None)
+
+    def load_sources(self):
+        """Load the sources the report uses once, concurrently; all pivots share these frames."""
+        for name, frame in self.registry.load_all(self.max_workers, names=self.plan.sources).items():
+            setattr(self, f'df_{name}', frame)
+        self.load_times = dict(self.registry.load_times)
+
+    def build_pivots(self):
+        for name, pivot in self.plan.execute(self.registry).items():
+            setattr(self, name, pivot)
+        print(self.plan.describe())
+
+    @staticmethod
+    def threshold_of(df, highlight):
+        """Numeric highlight threshold; {'top': n, 'column': c} is the n-th largest value of column c."""
+        if not isinstance(highlight, dict):
+            return highlight
+        if highlight['column'] not in df.columns:
+            return np.inf
+        return df[highlight['column']].nlargest(highlight['top']).min()
+
+    @staticmethod
+    def highlight_css(df, highlight):
+        """CSS matrix for a table: cells above its threshold in bold (orange for fixed thresholds)."""
+        threshold = DailyReporter.threshold_of(df, highlight)
+        style = 'font-weight: bold; ' if isinstance(highlight, dict) else 'font-weight: bold; background-color: orange;'
+        rules = [] if threshold is None else [(('gt', threshold), style)]
+        return DataFrameStyler.style_matrix(df, rules, axis=None, default='border: 1px solid;')
+
+    def render_html(self):
+        writer = HtmlTableWriter(classes=self.classes)
+        body = io.StringIO()
+        for table in self.plan.tables:
+            df = getattr(self, table['name'])
+            body.write(f"<h5>{table['title']}</h5>")
+            writer.write(df, body, self.highlight_css(df, table['highlight']))
+            body.write("<div class='pagebreak' style=\"break-after:page\"></div>" if table['page_break'] else "<br/>")
+        return Path(self.template_path).read_text() % (writer.stylesheet() + body.getvalue())
+
+    def export_listings(self, output_path=None):
+        """Write the rows behind every table to one sheet each, streamed in constant memory."""
+        output_path = output_path or os.path.join(self.download_dir, "listing_" + time.strftime("%Y_%m_%d") + ".xlsx")
+        with ExcelStreamWriter(output_path) as writer:
+            for table in self.plan.tables:
+                writer.write(self.plan.listings[table['name']], sheet_name(table['title'], writer.sheets))
+        print(f"Listings saved to {output_path}")
+        return output_path
+
+    def export_worklists(self, table='df_claim_pivot3', by='TASK ID', formats=('pdf', 'xlsx'), output_dir=None):
+        """One worklist per TASK ID / GROUP ID from the rows behind a report table, plus manifest.csv."""
+        if not self.plan.listings:
+            self.load_sources()
+            self.build_pivots()
+        spec = next(t for t in self.plan.tables if t['name'] == table)
+        output_dir = output_dir or os.path.join(self.download_dir, "worklists_" + time.strftime("%Y_%m_%d"))
+        pool = PDFRenderPool(self.wkhtmltopdf_path, max_workers=self.max_workers) if 'pdf' in formats else None
+        fanout = WorklistFanout(output_dir, template_path=self.template_path, render_pool=pool,
+                                max_workers=self.max_workers, classes=self.classes, options=self.options)
+        return fanout.run(self.plan.listings[table], by=by, formats=formats, title=spec['title'])
+
+    def generate_daily_report(self, output_path=None, listings=True):
+        output_path = output_path or os.path.join(self.download_dir, "report_" + time.strftime("%Y_%m_%d") + ".pdf")
+        self.load_sources()
+        self.build_pivots()
+        html = self.render_html()
+        kwargs = {'options': self.options}
+        if self.wkhtmltopdf_path:
+            kwargs['configuration'] = pdfkit_configuration(self.wkhtmltopdf_path)
+        pdfkit.from_string(html, output_path, **kwargs)
+        print(f"Daily report saved to {output_path}")
+        if listings:
+            self.export_listings()
+        return output_path
@@ -1,24 +1,33 @@
+import warnings
+import numpy as np
 import pandas as pd
 
+
+"""
+Example usecase:
+css = DataFrameStyler.style_matrix(pivot, [
+    (('top', 3), 'background-color: orange;font-weight: bold;'),
+    (('gt', 5000), 'color: red;'),
+], axis=1, margins=True, default='border: 1px solid;')
+pivot.style.apply(lambda _: css, axis=None)
+
+DataFrameStyler.styled(pivot, [(('quantile', 0.75), 'background-color: khaki;')], axis=0)
+"""
 class DataFrameStyler:
     @staticmethod
     def highlight_min(s, color='green'):
-        is_max = s == s.min()
         attr = 'background-color: {}'.format(color)
-        return [attr if v else '' for v in is_max]
+        return np.where(s == s.min(), attr, '')
 
     @staticmethod
     def highlight_max(s, color='yellow'):
-        is_max = s == s.max()
         attr = 'background-color: {}'.format(color)
-        return [attr if v else '' for v in is_max]
+        return np.where(s == s.max(), attr, '')
 
     @staticmethod
     def highlight_top3(s, color='darkorange'):
-        top3_values = s.nlargest(3).index
-        is_top3 = s.index.isin(top3_values) & (s > 0)
         attr = 'background-color: {};font-weight: bold;'.format(color)
-        return [attr if v else '' for v in is_top3]
+        return np.where(DataFrameStyler.rule_mask(s.to_numpy(), ('top', 3), axis=0), attr, '')
 
     @staticmethod
     def conditional_color(val, cutoff=100, color='red'):
@@ -27,23 +36,78 @@ class DataFrameStyler:
 
     @staticmethod
     def color_quantile(s, color='red'):
-        quantile_4_threshold = s.quantile(0.75)
-        is_in_quantile_4 = (s >= quantile_4_threshold) & (s > 0)
         attr = 'background-color: {}'.format(color)
-        return [attr if v else '' for v in is_in_quantile_4]
+        return np.where(DataFrameStyler.rule_mask(s.to_numpy(), ('quantile', 0.75), axis=0), attr, '')
 
     @staticmethod
-    def get_styled_default(df,axis=1):
-        u = df.index.get_level_values(0)
-        cols = df.columns
-        """df_styled = df.style.apply(
-            DataFrameStyler.highlight_top3, color='darkred', subset=pd.IndexSlice[u[:-1], cols[:-1]], axis=axis
-        ).apply(
-            DataFrameStyler.color_quantile, color='khaki', subset=pd.IndexSlice[u[:-1], cols[:-1]], axis=axis
-        )"""
-        df_styled = df.style.apply(
-            DataFrameStyler.highlight_top3, color='orange', subset=pd.IndexSlice[u[:-1], cols[:-1]], axis=axis
-        )
-        return df_styled
+    def _nth_largest(values, n, axis):
+        """n-th largest value per column (axis=0), row (axis=1) or of the whole table (None)."""
+        if axis is None:
+            values, axis = values.ravel(), 0
+        size = values.shape[axis]
+        kth = size - min(n, size)
+        return np.expand_dims(np.partition(values, kth, axis=axis).take(kth, axis=axis), axis)
+
+    @staticmethod
+    def rule_mask(values, rule, axis=0):
+        """Boolean mask of the cells a rule selects, thresholds computed once per column/row/table.
+
+        Rules: ('gt', cutoff), ('top', n) for the n largest positive values,
+        ('max',), ('min',) and ('quantile', q) for positive values at or above
+        the q-quantile.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        kind = rule[0]
+        if values.size == 0:
+            return np.zeros(values.shape, dtype=bool)
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            # all-NaN rows or columns simply match nothing
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if kind == 'gt':
+                return values > rule[1]
+            if kind == 'max':
+                return values == np.nanmax(values, axis=axis, keepdims=True)
+            if kind == 'min':
+                return values == np.nanmin(values, axis=axis, keepdims=True)
+            if kind == 'top':
+                filled = np.where(np.isnan(values), -np.inf, values)
+                return (filled >= DataFrameStyler._nth_largest(filled, rule[1], axis)) & (values > 0)
+            if kind == 'quantile':
+                return (values >= np.nanquantile(values, rule[1], axis=axis, keepdims=True)) & (values > 0)
+        raise ValueError(f"Unknown styling rule {rule!r}")
 
+    @staticmethod
+    def style_matrix(df, rules, axis=0, default='', margins=False):
+        """CSS for every cell of df as a NumPy string array, for df.style.apply(lambda _: css, axis=None).
+
+        `rules` is a list of (rule, css); the css of every matching rule is
+        appended to `default`. With margins=True the last row and column
+        (pivot 'All' margins) are left out of the thresholds and unstyled.
+        """
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+            df = df.apply(pd.to_numeric, errors='coerce')
+        values = df.to_numpy(dtype=np.float64, na_value=np.nan)
+        inner = values[:-1, :-1] if margins else values
+        # every cell gets a code with one bit per matching rule; each distinct code is
+        # turned into its CSS string once and the matrix is a single take()
+        codes = np.zeros(inner.shape, dtype=np.int64)
+        for bit, (rule, _) in enumerate(rules):
+            codes |= DataFrameStyler.rule_mask(inner, rule, axis).astype(np.int64) << bit
+        used = np.unique(codes)
+        lookup = np.array([default] + [default + ''.join(css for bit, (_, css) in enumerate(rules) if code >> bit & 1)
+                                       for code in used])
+        css = np.full(values.shape, default, dtype=lookup.dtype)
+        block = css[:-1, :-1] if margins else css
+        block[...] = lookup[1:][np.searchsorted(used, codes)] if codes.size else default
+        return css
+
+    @staticmethod
+    def styled(df, rules, axis=0, default='', margins=False):
+        css = DataFrameStyler.style_matrix(df, rules, axis, default, margins)
+        return df.style.apply(lambda _: css, axis=None)
 
+    @staticmethod
+    def get_styled_default(df,axis=1):
+        """Top 3 of every row (axis=1) or column (axis=0) in orange, margins excluded."""
+        return DataFrameStyler.styled(df, [(('top', 3), 'background-color: orange;font-weight: bold;')],
+                                      axis=axis, margins=True)
@@ -0,0 +1,262 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+
+MONTHS = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
+    'Jul': '07', 'Aug': '08', 'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+METRICS = ['AMOUNT', 'ECR', 'MEMBER']
+
+MONTH_PATTERN = re.compile(r'(' + '|'.join(MONTHS) + r')-(\d{4})', re.IGNORECASE)
+METRIC_PATTERN = re.compile(r'(' + '|'.join(METRICS) + r')', re.IGNORECASE)
+
+
+def _parse_estmst_worker(analyzer_class, filepath, kwargs):
+    return analyzer_class().parse_estmst_file(filepath, **kwargs)
+
+
+class EstmstCube:
+    """Dense EST x month x metric array of estmst data.
+
+    values[e, m, k] is metric k of establishment e in month m, with NaN where
+    the establishment has no row for that month. Months are a contiguous
+    monthly range, so a lag of 12 along axis 1 is exactly one year.
+    """
+
+    def __init__(self, values, est_ids, months, metrics=METRICS):
+        self.values = values
+        self.est_ids = np.asarray(est_ids, dtype=object)
+        self.months = pd.DatetimeIndex(months)
+        self.metrics = list(metrics)
+        self.est_index = {est_id: i for i, est_id in enumerate(self.est_ids)}
+        self.month_index = {month: i for i, month in enumerate(self.months)}
+        self.metric_index = {metric: i for i, metric in enumerate(self.metrics)}
+
+    @classmethod
+    def from_frame(cls, df, id_column='EST ID'):
+        """Build a cube from a tidy (EST ID, date, AMOUNT, ECR, MEMBER) frame."""
+        metrics = [m for m in METRICS if m in df.columns]
+        if len(df) == 0:
+            return cls(np.full((0, 0, len(metrics)), np.nan), [], pd.DatetimeIndex([]), metrics)
+        est_codes, est_ids = pd.factorize(df[id_column], sort=True)
+        dates = pd.DatetimeIndex(df['date'])
+        month_no = dates.year.to_numpy() * 12 + dates.month.to_numpy() - 1
+        first = month_no.min()
+        n_months = month_no.max() - first + 1
+        months = pd.date_range(pd.Timestamp(year=first // 12, month=first % 12 + 1, day=1),
+                               periods=n_months, freq='MS')
+        values = np.full((len(est_ids), n_months, len(metrics)), np.nan)
+        values[est_codes, month_no - first] = df[metrics].to_numpy(dtype=np.float64)
+        return cls(values, est_ids, months, metrics)
+
+    def with_frame(self, df, id_column='EST ID'):
+        """New cube with the rows of a tidy frame added (replacing the metrics it has in cells already present)."""
+        addition = EstmstCube.from_frame(df, id_column)
+        est_ids = pd.Index(self.est_ids).union(pd.Index(addition.est_ids))
+        months = self.months.union(addition.months)
+        if len(months):
+            months = pd.date_range(months.min(), months.max(), freq='MS')
+        values = np.full((len(est_ids), len(months), len(self.metrics)), np.nan)
+        values[np.ix_(est_ids.get_indexer(self.est_ids), months.get_indexer(self.months))] = self.values
+        rows = est_ids.get_indexer(addition.est_ids)
+        cols = months.get_indexer(addition.months)
+        # only the metrics the frame carries (e.g. parsed with metrics=['MEMBER']) are replaced
+        metrics = [k for k, metric in enumerate(self.metrics) if metric in addition.metric_index]
+        block = addition.values[..., [addition.metric_index[self.metrics[k]] for k in metrics]]
+        # and only in the cells the new frame actually has
+        est, month = np.nonzero(~np.isnan(block).all(axis=2))
+        values[rows[est][:, None], cols[month][:, None], metrics] = block[est, month]
+        return EstmstCube(values, est_ids, months, self.metrics)
+
+    def _metric(self, metric):
+        return self.values if metric is None else self.values[..., self.metric_index[metric]]
+
+    def series(self, est_id, metric=None):
+        """Time series of one establishment (a view, no copy)."""
+        return self._metric(metric)[self.est_index[est_id]]
+
+    def delta(self, lag, metric=None, pct=False):
+        """Change against `lag` months earlier for every establishment at once."""
+        values = self._metric(metric)
+        result = np.full(values.shape, np.nan)
+        if lag < values.shape[1]:
+            previous = values[:, :-lag]
+            change = values[:, lag:] - previous
+            if pct:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    change = np.where(previous != 0, change * 100 / previous, np.nan)
+            result[:, lag:] = change
+        return result
+
+    def mom(self, metric=None, pct=False):
+        return self.delta(1, metric, pct)
+
+    def yoy(self, metric=None, pct=False):
+        return self.delta(12, metric, pct)
+
+    def rolling_mean(self, window, metric=None):
+        """Trailing mean over `window` months, ignoring missing months; NaN until the window is full."""
+        values = self._metric(metric)
+        filled = np.nan_to_num(values)
+        counts = (~np.isnan(values)).astype(np.float64)
+        pad = [(0, 0)] * values.ndim
+        pad[1] = (1, 0)
+        sums = np.cumsum(np.pad(filled, pad), axis=1)
+        counts = np.cumsum(np.pad(counts, pad), axis=1)
+        window_sums = sums[:, window:] - sums[:, :-window]
+        window_counts = counts[:, window:] - counts[:, :-window]
+        result = np.full(values.shape, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result[:, window - 1:] = np.where(window_counts > 0, window_sums / window_counts, np.nan)
+        return result
+
+    def gaps(self, metric='ECR'):
+        """Months with no contribution between an establishment's first and last active month."""
+        active = np.nan_to_num(self._metric(metric)) > 0
+        n_months = active.shape[1]
+        first = active.argmax(axis=1)
+        last = n_months - 1 - active[:, ::-1].argmax(axis=1)
+        month = np.arange(n_months)
+        inside = (month >= first[:, None]) & (month <= last[:, None]) & active.any(axis=1)[:, None]
+        return inside & ~active
+
+    def to_frame(self):
+        """Back to the tidy (EST ID, date, metrics...) frame, dropping empty cells.
+
+        Metrics are nullable Int64, so a month with only some metrics keeps
+        the missing ones as <NA>.
+        """
+        present = ~np.isnan(self.values).all(axis=2)
+        est, month = np.nonzero(present)
+        df = pd.DataFrame(self.values[est, month], columns=self.metrics).astype('Int64')
+        df.insert(0, 'date', self.months[month])
+        df.insert(0, EstmstAnalyzer.ID_COLUMN, self.est_ids[est])
+        return df
+
+
+"""
+Example usecase:
+analyzer = EstmstAnalyzer()
+df16 = analyzer.parse_estmst_file('2016.csv')                # long: EST ID, date, type, value
+df16 = analyzer.parse_estmst_file('2016.csv', wide=True)     # tidy: EST ID, date, AMOUNT, ECR, MEMBER
+recent = analyzer.parse_estmst_file('12months.csv', last_months=6, metrics=['MEMBER'])
+df = analyzer.analyze_multiple_estmst_files({'2016': '2016.csv', '12months': '12months.csv'})
+cube = analyzer.to_cube(df)
+member_yoy = cube.yoy('MEMBER', pct=True)                 # EST x month, all establishments at once
+cube.series('PYKRP0000024000', 'MEMBER')
+"""
+class EstmstAnalyzer:
+    """Parses the wide estmst sheets (one row per EST ID, one column per month and metric).
+
+    The metric of a column comes from the header itself ("Jan-2016_AMOUNT") or,
+    in the downloaded format, from a second header row whose EST ID cell reads
+    "EST ID" and whose other cells read AMOUNT/ECR/MEMBER. Columns without a
+    month (such as the trailing total) are ignored.
+    """
+
+    ID_COLUMN = 'EST ID'
+
+    @staticmethod
+    def _change_col(x):
+        year = x[-4:]
+        month = MONTHS[x[:3].title()]
+        return str(year) + '-' + str(month)
+
+    def _column_spec(self, filepath, start=None, end=None, metrics=None, last_months=None, months=None):
+        """Parse the header once into a (column, date, type) frame of the columns to read."""
+        head = pd.read_csv(filepath, nrows=1, dtype=str)
+        has_subheader = len(head) > 0 and str(head[self.ID_COLUMN].iloc[0]).strip().upper() == self.ID_COLUMN
+        rows = []
+        for column in head.columns:
+            if column == self.ID_COLUMN:
+                continue
+            month = MONTH_PATTERN.search(column)
+            label = head[column].iloc[0] if has_subheader else column
+            metric = METRIC_PATTERN.search(str(label))
+            if month is None or metric is None:
+                continue
+            rows.append((column, self._change_col(month.group(1) + '-' + month.group(2)), metric.group(1).upper()))
+        spec = pd.DataFrame(rows, columns=['column', 'date', 'type'])
+        spec['date'] = pd.to_datetime(spec['date'], format='%Y-%m')
+
+        keep = np.ones(len(spec), dtype=bool)
+        if start is not None:
+            keep &= (spec['date'] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            keep &= (spec['date'] <= pd.Timestamp(end)).to_numpy()
+        if metrics is not None:
+            keep &= spec['type'].isin([m.upper() for m in metrics]).to_numpy()
+        if months is not None:
+            keep &= spec['date'].dt.strftime('%Y-%m').isin(list(months)).to_numpy()
+        if last_months is not None:
+            recent = np.sort(spec.loc[keep, 'date'].unique())[-last_months:]
+            keep &= spec['date'].isin(recent).to_numpy()
+        return spec[keep].reset_index(drop=True), has_subheader
+
+    def parse_estmst_file(self, filepath, wide=False, start=None, end=None, metrics=None, last_months=None,
+                          months=None):
+        """Read one estmst sheet into a long (EST ID, date, type, value) frame.
+
+        With wide=True the long frame is pivoted once into a tidy
+        (EST ID, date, AMOUNT, ECR, MEMBER) frame.
+
+        start/end ('2023-04'), months (['2023-04', '2023-07']), metrics
+        (['MEMBER']) and last_months (12) select columns from the header before
+        reading, so the remaining months are never parsed.
+        """
+        spec, has_subheader = self._column_spec(filepath, start, end, metrics, last_months, months)
+        df = pd.read_csv(filepath, usecols=[self.ID_COLUMN] + list(spec['column']),
+                         skiprows=[1] if has_subheader else None, dtype={self.ID_COLUMN: str},
+                         thousands=',', low_memory=False)
+        df_long = self._melt(df, spec)
+        return self._pivot(df_long, metrics) if wide else df_long
+
+    def _melt(self, df, spec):
+        # column-major ravel == DataFrame.melt, without materialising the column names per row
+        values = df[list(spec['column'])]
+        if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in values.dtypes):
+            values = values.apply(pd.to_numeric, errors='coerce')
+        n_rows = len(df)
+        return pd.DataFrame({
+            self.ID_COLUMN: np.tile(df[self.ID_COLUMN].to_numpy(), len(spec)),
+            'date': np.repeat(spec['date'].to_numpy(), n_rows),
+            'type': pd.Categorical(np.repeat(spec['type'].to_numpy(), n_rows), categories=METRICS),
+            'value': np.nan_to_num(values.to_numpy(dtype=np.float64).ravel(order='F')).astype(np.int64),
+        })
+
+    def _pivot(self, df_long, metrics=None):
+        metrics = [m for m in METRICS if metrics is None or m in [x.upper() for x in metrics]]
+        df_wide = df_long.pivot(index=[self.ID_COLUMN, 'date'], columns='type', values='value')
+        df_wide = df_wide.reindex(columns=metrics).fillna(0).astype(np.int64)
+        df_wide.columns.name = None
+        return df_wide.sort_index().reset_index()
+
+    def analyze_multiple_estmst_files(self, filenames, max_workers=None, start=None, end=None, metrics=None):
+        """Parse several estmst sheets and return one tidy frame sorted by (EST ID, date).
+
+        Files are parsed concurrently in a process pool. When files overlap (a
+        yearly sheet and the rolling 12months sheet both carrying a month) the
+        value from the file listed later in `filenames` wins, so list the most
+        recent download last. start/end/metrics are passed on to
+        parse_estmst_file.
+        """
+        paths = list(filenames.values())
+        kwargs = {'start': start, 'end': end, 'metrics': metrics}
+        if max_workers == 1 or len(paths) < 2:
+            frames = [self.parse_estmst_file(path, **kwargs) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                frames = list(executor.map(_parse_estmst_worker, [type(self)] * len(paths), paths,
+                                           [kwargs] * len(paths)))
+        df_long = pd.concat(frames, ignore_index=True)
+        df_long = df_long.drop_duplicates([self.ID_COLUMN, 'date', 'type'], keep='last')
+        return self._pivot(df_long, metrics)
+
+    def to_cube(self, df):
+        """Dense EstmstCube view of a tidy (or long) estmst frame."""
+        if 'type' in df.columns:
+            df = self._pivot(df)
+        return EstmstCube.from_frame(df, self.ID_COLUMN)
@@ -0,0 +1,114 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from .estmst_analyzer import EstmstAnalyzer, EstmstCube
+
+
+"""
+Example usecase:
+store = EstmstStore('estmst_store')
+for year in range(2016, 2022):
+    store.append_file(f'{year}.csv')
+store.append_file('12months.csv')       # only months not yet in the store are parsed and written
+
+# next month
+store.append_file('estmst_2024_05.csv')
+cube = store.to_cube()
+"""
+class EstmstStore:
+    """Append-only Parquet store of estmst data, partitioned by year.
+
+    Every month is one file, root/year=YYYY/YYYY-MM.parquet, holding
+    (EST ID, AMOUNT, ECR, MEMBER). Appending a month writes only that file and
+    the small index.json, so earlier partitions are never rewritten. Needs
+    pyarrow (pip install epftools[parquet]).
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, root, analyzer=None):
+        self.root = root
+        self.analyzer = analyzer or EstmstAnalyzer()
+        os.makedirs(root, exist_ok=True)
+        self.index = self._read_index()
+        self._cube = None
+
+    def _read_index(self):
+        path = os.path.join(self.root, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return {'months': {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_index(self):
+        path = os.path.join(self.root, self.INDEX_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(path + '.tmp', path)
+
+    @property
+    def months(self):
+        return sorted(self.index['months'])
+
+    def _partition_path(self, month):
+        return os.path.join(self.root, f'year={month[:4]}', f'{month}.parquet')
+
+    def append_file(self, filepath, overwrite=False):
+        """Add the months of an estmst sheet that the store does not have yet.
+
+        Only the new months' columns are parsed. With overwrite=True months
+        already in the store are replaced from this file instead of skipped.
+        Returns the list of months written.
+        """
+        spec, _ = self.analyzer._column_spec(filepath)
+        file_months = sorted(spec['date'].dt.strftime('%Y-%m').unique())
+        new_months = [m for m in file_months if overwrite or m not in self.index['months']]
+        if not new_months:
+            return []
+        replaced = [m for m in new_months if m in self.index['months']]
+
+        df = self.analyzer.parse_estmst_file(filepath, wide=True, months=new_months)
+        for month, part in df.groupby(df['date'].dt.strftime('%Y-%m'), sort=True):
+            path = self._partition_path(month)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            part.drop(columns='date').reset_index(drop=True).to_parquet(path, index=False)
+            self.index['months'][month] = {'file': os.path.relpath(path, self.root), 'rows': len(part),
+                                           'source': os.path.basename(filepath)}
+        self._write_index()
+
+        if self._cube is not None:
+            self._cube = self._clear_months(self._cube, replaced).with_frame(df)
+        return new_months
+
+    @staticmethod
+    def _clear_months(cube, months):
+        """Copy of cube with every cell of the given months emptied, so a rewritten month keeps no stale rows."""
+        columns = cube.months.get_indexer(pd.to_datetime(months, format='%Y-%m'))
+        columns = columns[columns >= 0]
+        if not len(columns):
+            return cube
+        values = cube.values.copy()
+        values[:, columns] = np.nan
+        return EstmstCube(values, cube.est_ids, cube.months, cube.metrics)
+
+    def to_frame(self, start=None, end=None):
+        """Tidy (EST ID, date, AMOUNT, ECR, MEMBER) frame read from the matching partitions only."""
+        months = [m for m in self.months
+                  if (start is None or m >= str(start)[:7]) and (end is None or m <= str(end)[:7])]
+        frames = []
+        for month in months:
+            part = pd.read_parquet(os.path.join(self.root, self.index['months'][month]['file']))
+            part.insert(1, 'date', pd.Timestamp(month + '-01'))
+            frames.append(part)
+        if not frames:
+            return pd.DataFrame(columns=[self.analyzer.ID_COLUMN, 'date', 'AMOUNT', 'ECR', 'MEMBER'])
+        df = pd.concat(frames, ignore_index=True)
+        return df.sort_values([self.analyzer.ID_COLUMN, 'date'], kind='stable').reset_index(drop=True)
+
+    def to_cube(self):
+        """EstmstCube of the whole store; kept up to date by later appends."""
+        if self._cube is None:
+            self._cube = EstmstCube.from_frame(self.to_frame(), self.analyzer.ID_COLUMN)
+        return self._cube
@@ -0,0 +1,133 @@
+import re
+import numpy as np
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+
+EXCEL_MAX_ROWS = 1048576
+
+
+def sheet_name(title, used=()):
+    """Valid, unused Excel sheet name for a title (no []:*?/\\, at most 31 characters)."""
+    base = re.sub(r'[\[\]:*?/\\]', ' ', str(title)).strip() or 'Sheet'
+    name = base[:31]
+    n = 1
+    while name.lower() in {u.lower() for u in used}:
+        n += 1
+        suffix = f' ({n})'
+        name = base[:31 - len(suffix)] + suffix
+    return name
+
+
+def _column_values(values):
+    """One column as a list of plain Python values xlsxwriter can write; missing values become None."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if values.dt.tz is not None:
+            values = values.dt.tz_localize(None)
+        out = np.asarray(values.dt.to_pydatetime(), dtype=object)
+    elif pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        out = values.to_numpy(dtype=object, na_value=None)
+    else:
+        out = values.to_numpy(dtype=object)
+    missing = values.isna().to_numpy()
+    if missing.any():
+        out = np.where(missing, None, out)
+    return out.tolist()
+
+
+"""
+Example usecase:
+with ExcelStreamWriter('listings.xlsx') as writer:
+    writer.write(df_claim, 'Claims')
+    writer.write(df_tin, 'Transfer In', formats={'PENDING DAYS': '0'})
+
+write_sheets('listings.xlsx', {'Claims': df_claim, 'Transfer In': df_tin})
+"""
+class ExcelStreamWriter:
+    """Writes DataFrames to an .xlsx in xlsxwriter's constant_memory mode.
+
+    Rows are written block by block and flushed to disk as they go, so
+    memory stays flat for listings of any length. Column widths and formats
+    are set once per column instead of once per cell. Writing to a sheet
+    that already exists appends below its last row.
+    """
+
+    def __init__(self, path, block_rows=10000, date_format='dd-mm-yyyy', datetime_format='dd-mm-yyyy hh:mm'):
+        if xlsxwriter is None:
+            raise ImportError("Excel export needs xlsxwriter. Install it with: pip install epftools[excel]")
+        self.path = path
+        self.block_rows = block_rows
+        self.workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+        self.header_format = self.workbook.add_format({'bold': True})
+        self.date_format = self.workbook.add_format({'num_format': date_format})
+        self.datetime_format = self.workbook.add_format({'num_format': datetime_format})
+        self._formats = {}
+        self.sheets = {}
+        self.rows = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.workbook.close()
+
+    def _format(self, num_format):
+        if num_format not in self._formats:
+            self._formats[num_format] = self.workbook.add_format({'num_format': num_format})
+        return self._formats[num_format]
+
+    def _set_columns(self, worksheet, df, formats):
+        for i, column in enumerate(df.columns):
+            values = df.iloc[:, i]
+            if column in formats:
+                fmt = self._format(formats[column])
+            elif pd.api.types.is_datetime64_any_dtype(values):
+                times = values.dropna()
+                fmt = self.datetime_format if (times != times.dt.normalize()).any() else self.date_format
+            else:
+                fmt = None
+            width = min(max(len(str(column)), 8) + 2, 50)
+            worksheet.set_column(i, i, width, fmt)
+
+    def write(self, df, sheet_name='Sheet1', header=True, index=False, formats=None):
+        """Write df to sheet_name; `formats` maps column names to Excel number formats."""
+        if index:
+            df = df.reset_index()
+        formats = formats or {}
+        if sheet_name not in self.sheets:
+            worksheet = self.workbook.add_worksheet(sheet_name)
+            self._set_columns(worksheet, df, formats)
+            self.sheets[sheet_name] = worksheet
+            self.rows[sheet_name] = 0
+        worksheet = self.sheets[sheet_name]
+        row = self.rows[sheet_name]
+        if row + len(df) + bool(header) > EXCEL_MAX_ROWS:
+            raise ValueError(f"{len(df)} rows do not fit in sheet {sheet_name!r} after row {row}")
+        if header:
+            worksheet.write_row(row, 0, [str(c) for c in df.columns], self.header_format)
+            row += 1
+        for start in range(0, len(df), self.block_rows):
+            block = df.iloc[start:start + self.block_rows]
+            columns = [_column_values(block.iloc[:, i]) for i in range(block.shape[1])]
+            for values in zip(*columns):
+                worksheet.write_row(row, 0, values)
+                row += 1
+        self.rows[sheet_name] = row
+        return row
+
+
+def write_sheets(path, sheets, header=True, index=False, block_rows=10000):
+    """Stream several DataFrames ({sheet name: df}) into one workbook."""
+    with ExcelStreamWriter(path, block_rows=block_rows) as writer:
+        for name, df in sheets.items():
+            writer.write(df, name, header=header, index=index)
+    return path
@@ -1,6 +1,8 @@
 import os
 import pandas as pd
 
+from .excel_export import ExcelStreamWriter, xlsxwriter
+
 class ExcelMerger:
     def __init__(self, folder_path, ext=".xlsx", sheetnum=0):
         self.folder_path = folder_path
@@ -33,10 +35,14 @@ class ExcelMerger:
         return frames
 
     def merge_and_save(self, output_filename="merged.xlsx"):
-        # Concatenate the frames
-        combined = pd.concat(self.frames)
-        # Write it out to Excel
-        combined.to_excel(output_filename, header=False, index=False)
+        if xlsxwriter is None:
+            # xlsxwriter is optional (epftools[excel]); let pandas pick whichever engine is installed
+            pd.concat(self.frames, ignore_index=True).to_excel(output_filename, header=False, index=False)
+        else:
+            # Stream the frames one after another into a single sheet instead of concatenating them
+            with ExcelStreamWriter(output_filename) as writer:
+                for df in self.frames:
+                    writer.write(df, 'Sheet1', header=False)
         print(f"Merged Excel files saved to {output_filename}")
 
 """
@@ -0,0 +1,115 @@
+import hashlib
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+GROUP_OFFICERS = {
+    'GM': [110, 111, 112, 113],
+    'NK': [106, 107, 109, 114],
+    'VK': [104, 105, 108, 188],
+    'SR': [101, 102, 103],
+}
+
+
+"""
+Example usecase:
+groups = GroupDimension.from_file('groups.csv')     # GROUP ID,Officer,Section,Zone
+df = groups.attach(df)                              # adds Officer, Section and Zone
+df['Officer'] = groups.lookup(df['GROUP ID'], 'Officer')
+
+groups = GroupDimension.from_groups({'Officer': {'GM': [110, 111], 'SR': [101, 102]},
+                                     'Zone': {'North': [101, 102, 110, 111]}})
+"""
+class GroupDimension:
+    """GROUP ID -> officer / section / zone attributes, resolved by array indexing.
+
+    Each attribute is stored as a category code per GROUP ID in a NumPy
+    array indexed by the group number, so attaching it to a frame is one
+    take() over the GROUP ID column with no string comparisons. Attribute
+    columns come back as categoricals; unknown groups are NaN.
+    """
+
+    KEY = 'GROUP ID'
+
+    def __init__(self, table):
+        table = pd.DataFrame(table)
+        if self.KEY not in table.columns:
+            raise ValueError(f"Group table needs a '{self.KEY}' column, got {list(table.columns)}")
+        groups = pd.to_numeric(table[self.KEY], errors='raise').astype(np.int64)
+        if groups.duplicated().any():
+            raise ValueError(f"Groups listed more than once: {sorted(set(groups[groups.duplicated()]))}")
+        self.table = table.assign(**{self.KEY: groups}).sort_values(self.KEY).reset_index(drop=True)
+        self.attributes = [c for c in self.table.columns if c != self.KEY]
+        groups = self.table[self.KEY].to_numpy()
+        self.offset = int(groups.min()) if len(groups) else 0
+        self.size = int(groups.max()) - self.offset + 1 if len(groups) else 0
+        self._codes = {}
+        self._categories = {}
+        for attribute in self.attributes:
+            codes, categories = pd.factorize(self.table[attribute], sort=True)
+            lookup = np.full(self.size, -1, dtype=np.int32)
+            lookup[groups - self.offset] = codes
+            self._codes[attribute] = lookup
+            self._categories[attribute] = categories
+
+    @classmethod
+    def from_groups(cls, mapping):
+        """Dimension from {attribute: {value: [group, ...]}}, e.g. {'Officer': GROUP_OFFICERS}."""
+        columns = {}
+        for attribute, values in mapping.items():
+            columns[attribute] = pd.Series({group: value for value, groups in values.items() for group in groups})
+        table = pd.DataFrame(columns)
+        return cls(table.rename_axis(cls.KEY).reset_index())
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def default(cls):
+        """The office's officer assignment (GROUP_OFFICERS)."""
+        return cls.from_groups({'Officer': GROUP_OFFICERS})
+
+    @classmethod
+    def from_file(cls, path):
+        """Dimension from a CSV table or a YAML file holding rows (or {'groups': rows})."""
+        if str(path).lower().endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise ImportError("Reading groups from YAML needs PyYAML. Install it with: pip install epftools[yaml]")
+            with open(path) as f:
+                spec = yaml.safe_load(f)
+            return cls(spec['groups'] if isinstance(spec, dict) else spec)
+        return cls(pd.read_csv(path))
+
+    def __repr__(self):
+        # content based, so Parquet sidecar keys change when the group table does
+        digest = hashlib.blake2b(self.table.to_csv(index=False).encode(), digest_size=8).hexdigest()
+        return f"GroupDimension({len(self.table)} groups, {self.attributes}, {digest})"
+
+    def _positions(self, groups):
+        """Index of each GROUP ID into the lookup arrays, -1 for unknown or missing groups."""
+        values = pd.to_numeric(pd.Series(groups), errors='coerce').astype('Int64')
+        positions = values.to_numpy(dtype=np.int64, na_value=self.offset - 1) - self.offset
+        positions[(positions < 0) | (positions >= self.size)] = -1
+        return positions
+
+    def _resolve(self, attribute, positions):
+        if attribute not in self._codes:
+            raise KeyError(f"Unknown group attribute '{attribute}'. Available: {', '.join(self.attributes)}")
+        lookup = self._codes[attribute]
+        codes = np.where(positions >= 0, lookup[np.maximum(positions, 0)], -1) if self.size else positions
+        return pd.Categorical.from_codes(codes, categories=self._categories[attribute])
+
+    def lookup(self, groups, attribute='Officer'):
+        """Attribute of each GROUP ID in groups, as a categorical Series aligned with it."""
+        index = groups.index if isinstance(groups, pd.Series) else None
+        return pd.Series(self._resolve(attribute, self._positions(groups)), index=index, name=attribute)
+
+    def attach(self, df, column='GROUP ID', attributes=None):
+        """df with one column per attribute (all of them by default) looked up from df[column]."""
+        positions = self._positions(df[column])
+        return df.assign(**{attribute: self._resolve(attribute, positions)
+                            for attribute in (attributes or self.attributes)})
@@ -0,0 +1,145 @@
+import io
+from html import escape
+import numpy as np
+import pandas as pd
+from pandas.io.formats.format import format_array
+
+
+"""
+Example usecase:
+writer = HtmlTableWriter(classes='table table-sm table-bordered')
+css = DataFrameStyler.style_matrix(pivot, [(('gt', 50), 'background-color: orange;')])
+body = "<h5>Pendency</h5>" + writer.to_html(pivot, css) + writer.to_html(listing)
+html = template % (writer.stylesheet() + body)
+
+with open('listing.html', 'w') as f:           # very long listings can be streamed
+    f.write(writer.stylesheet())
+    writer.write(listing, f)
+"""
+class HtmlTableWriter:
+    """Writes DataFrames straight to HTML tables with class-based CSS.
+
+    Cell padding, font size and alignment come from one stylesheet instead
+    of an inline style on every cell, and per-cell styles (a CSS matrix from
+    DataFrameStyler.style_matrix) become one class per distinct style. Rows
+    are written to the output as they are formatted, so nothing is parsed
+    back afterwards.
+    """
+
+    TABLE_CLASS = 'epf-table'
+
+    def __init__(self, classes='table table-sm table-bordered border-primary d-print-table fs-6',
+                 td_style='font-size:10px;padding:2px;text-align:center;',
+                 th_style='font-size:10px;padding:2px;text-align:center;',
+                 precision=6, na_rep='', chunk_rows=5000):
+        self.classes = classes
+        self.td_style = td_style
+        self.th_style = th_style
+        self.precision = precision
+        self.na_rep = na_rep
+        self.chunk_rows = chunk_rows
+        self._cell_classes = {}
+
+    def _cell_class(self, css):
+        if css not in self._cell_classes:
+            self._cell_classes[css] = f'{self.TABLE_CLASS}-c{len(self._cell_classes)}'
+        return self._cell_classes[css]
+
+    def stylesheet(self):
+        """<style> block for every table written so far (and the base td/th rules)."""
+        rules = [f'table.{self.TABLE_CLASS} td {{{self.td_style}}}',
+                 f'table.{self.TABLE_CLASS} th {{{self.th_style}}}']
+        rules += [f'table.{self.TABLE_CLASS} .{name} {{{css}}}' for css, name in self._cell_classes.items()]
+        return '<style>\n' + '\n'.join(rules) + '\n</style>\n'
+
+    def _format_column(self, values):
+        """Escaped display strings of one column."""
+        values = pd.Series(values)
+        missing = values.isna().to_numpy()
+        if pd.api.types.is_float_dtype(values):
+            # pandas' own float formatter, so 12.0 prints as in DataFrame.to_html and not as 12.000000
+            floats = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            text = np.array([s.strip() for s in format_array(floats, None, digits=self.precision, leading_space=False)],
+                            dtype=object)
+        else:
+            text = np.array([escape(str(v)) for v in values], dtype=object)
+        return np.where(missing, escape(self.na_rep), text)
+
+    @classmethod
+    def _sparse_spans(cls, index):
+        """rowspan/colspan per level of a (Multi)Index, as pandas sparsifies it.
+
+        An outer label spans its run of equal labels, a run also ending where
+        any outer level changes; 0 marks positions covered by a span. The
+        innermost level is never merged.
+        """
+        n = len(index)
+        spans = []
+        changed = np.zeros(max(n - 1, 0), dtype=bool)
+        for level in range(index.nlevels - 1):
+            codes = pd.factorize(index.get_level_values(level))[0]
+            changed |= codes[1:] != codes[:-1]
+            starts = np.flatnonzero(np.r_[True, changed])
+            level_spans = np.zeros(n, dtype=np.int64)
+            level_spans[starts] = np.diff(np.r_[starts, n])
+            spans.append(level_spans)
+        spans.append(np.ones(n, dtype=np.int64))
+        return spans
+
+    def _header(self, df):
+        columns, index = df.columns, df.index
+        rows = []
+        column_spans = self._sparse_spans(columns)
+        for level in range(columns.nlevels):
+            cells = ['<th></th>'] * (index.nlevels - 1)
+            name = columns.names[level]
+            cells.append(f'<th>{escape(str(name)) if name is not None else ""}</th>')
+            labels = columns.get_level_values(level)
+            for label, span in zip(labels, column_spans[level]):
+                if span:
+                    colspan = f' colspan="{span}"' if span > 1 else ''
+                    cells.append(f'<th{colspan}>{escape(str(label))}</th>')
+            rows.append('<tr>' + ''.join(cells) + '</tr>')
+        if any(name is not None for name in index.names):
+            cells = [f'<th>{escape(str(name)) if name is not None else ""}</th>' for name in index.names]
+            cells += ['<th></th>'] * len(columns)
+            rows.append('<tr>' + ''.join(cells) + '</tr>')
+        return '<thead>\n' + '\n'.join(rows) + '\n</thead>\n'
+
+    def write(self, df, out, css=None):
+        """Write df as a <table> to the file-like `out`; `css` is an optional per-cell style matrix."""
+        out.write(f'<table class="{escape(self.classes)} {self.TABLE_CLASS}">\n')
+        out.write(self._header(df))
+        out.write('<tbody>\n')
+        n_rows = len(df)
+        index_spans = self._sparse_spans(df.index)
+        index_labels = [np.array([escape(str(v)) for v in df.index.get_level_values(level)], dtype=object)
+                        for level in range(df.index.nlevels)]
+        columns = [self._format_column(df.iloc[:, i]) for i in range(df.shape[1])]
+        if css is not None:
+            css = np.asarray(css)
+            class_attr = np.full(css.shape, '', dtype=object)
+            for style in np.unique(css):
+                if style:
+                    class_attr[css == style] = f' class="{self._cell_class(style)}"'
+        for start in range(0, n_rows, self.chunk_rows):
+            lines = []
+            for row in range(start, min(start + self.chunk_rows, n_rows)):
+                cells = []
+                for level, spans in enumerate(index_spans):
+                    span = spans[row]
+                    if span:
+                        rowspan = f' rowspan="{span}"' if span > 1 else ''
+                        cells.append(f'<th{rowspan}>{index_labels[level][row]}</th>')
+                if css is None:
+                    cells += [f'<td>{column[row]}</td>' for column in columns]
+                else:
+                    cells += [f'<td{class_attr[row, i]}>{column[row]}</td>' for i, column in enumerate(columns)]
+                lines.append('<tr>' + ''.join(cells) + '</tr>\n')
+            out.write(''.join(lines))
+        out.write('</tbody>\n</table>\n')
+
+    def to_html(self, df, css=None):
+        buffer = io.StringIO()
+        self.write(df, buffer, css)
+        return buffer.getvalue()
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+
+def _sort_codes(values, ascending=True):
+    """Integer codes that sort like values, missing values last in either direction."""
+    try:
+        codes, uniques = pd.factorize(values, sort=True)
+    except TypeError:
+        # mixed types (e.g. 10101 and '10600-sum') sort as text
+        codes, uniques = pd.factorize(values.astype(str), sort=True)
+    if not ascending:
+        codes = np.where(codes >= 0, len(uniques) - 1 - codes, codes)
+    return np.where(codes >= 0, codes, len(uniques))
+
+
+def _partition_keys(values):
+    """Partition labels as plain values: whole-number floats (integers with gaps) become ints, gaps pd.NA."""
+    values = pd.Series(values)
+    missing = values.isna().to_numpy()
+    if pd.api.types.is_float_dtype(values):
+        present = values[~missing]
+        if (present == np.floor(present)).all():
+            values = values.astype('Int64')
+    return [pd.NA if gap else value for value, gap in zip(values.astype(object), missing)]
+
+
+def sort_order(df, keys, ascending=True):
+    """Stable row order of df sorted by keys, as a position array."""
+    if isinstance(ascending, bool):
+        ascending = [ascending] * len(keys)
+    if not keys:
+        return np.arange(len(df))
+    # lexsort takes its primary key last
+    return np.lexsort([_sort_codes(df[key], asc) for key, asc in zip(keys, ascending)][::-1])
+
+
+"""
+Example usecase:
+engine = ListingEngine(df_claim)                      # one sort by TASK ID, then oldest first
+engine.listing(status=['DA(Includes NTE)'], min_days=20)
+engine.listing(min_days=10, max_days=20)
+for task_id, rows in engine.partitions().items():     # contiguous slices of engine.sorted
+    engine.sorted.iloc[rows].to_excel(f'{task_id}.xlsx')
+"""
+class ListingEngine:
+    """Worklists over one frame sorted once by (TASK ID, PENDING DAYS).
+
+    Every listing is a position array (or a slice) into the sorted frame, so
+    it comes out in worklist order without sorting again. Each status-set or
+    pendency condition is evaluated once and shared by the listings that
+    use it. Rows of one TASK ID are contiguous in the sorted frame.
+    """
+
+    def __init__(self, df, keys=('TASK ID', 'PENDING DAYS'), ascending=(True, False)):
+        present = [i for i, key in enumerate(keys) if key in df.columns]
+        self.keys = [keys[i] for i in present]
+        self.order = sort_order(df, self.keys, [ascending[i] for i in present])
+        self.sorted = df.take(self.order)
+        self.conditions = {}
+
+    def __len__(self):
+        return len(self.sorted)
+
+    def condition(self, kind, value):
+        """Boolean array over the sorted rows for ('min_days', d), ('max_days', d) or ('status', [...])."""
+        key = (kind, tuple(value) if kind == 'status' else value)
+        if key not in self.conditions:
+            if kind == 'min_days':
+                mask = self.sorted['PENDING DAYS'].to_numpy() > value
+            elif kind == 'max_days':
+                mask = self.sorted['PENDING DAYS'].to_numpy() <= value
+            elif kind == 'status':
+                mask = self.sorted['STATUS'].isin(list(value)).to_numpy()
+            else:
+                raise ValueError(f"Unknown listing condition {kind!r}")
+            self.conditions[key] = mask
+        return self.conditions[key]
+
+    def select(self, status=None, min_days=None, max_days=None):
+        """Positions of the matching rows in the sorted frame (slice(None) when nothing is filtered).
+
+        Pendency is the range min_days < PENDING DAYS <= max_days.
+        """
+        mask = None
+        for kind, value in (('min_days', min_days), ('max_days', max_days), ('status', status)):
+            if value is not None:
+                condition = self.condition(kind, value)
+                mask = condition if mask is None else mask & condition
+        return slice(None) if mask is None else np.flatnonzero(mask)
+
+    def listing(self, status=None, min_days=None, max_days=None, columns=None):
+        rows = self.sorted.iloc[self.select(status, min_days, max_days)]
+        return rows if columns is None else rows[list(columns)]
+
+    def partitions(self, column=None, rows=slice(None)):
+        """{value: rows} for each value of column (default the first sort key) within `rows`.
+
+        For the first sort key these are contiguous slices; other columns get
+        position arrays that keep the sorted order. Rows with a missing value
+        form their own partition under pd.NA.
+        """
+        column = column or self.keys[0]
+        positions = np.arange(len(self.sorted))[rows]
+        values = self.sorted[column].iloc[positions]
+        if column == self.keys[0]:
+            codes = _sort_codes(values)
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], int)
+            ends = np.r_[starts[1:], len(codes)]
+            keys = _partition_keys(values.iloc[starts])
+            if isinstance(rows, slice):
+                return {key: slice(positions[a], positions[b - 1] + 1) for key, a, b in zip(keys, starts, ends)}
+            return {key: positions[a:b] for key, a, b in zip(keys, starts, ends)}
+        # missing values get a code of their own, so those rows form one more partition
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        grouped = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[grouped], np.arange(len(uniques) + 1))
+        return {key: positions[grouped[bounds[i]:bounds[i + 1]]] for i, key in enumerate(_partition_keys(uniques))}
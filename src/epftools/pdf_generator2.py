@@ -1,7 +1,16 @@
 import pdfkit
+from functools import lru_cache
 from pathlib import Path
 from bs4 import BeautifulSoup
 
+from .html_table import HtmlTableWriter
+
+
+@lru_cache(maxsize=None)
+def pdfkit_configuration(wkhtmltopdf_path=None):
+    """pdfkit configuration for a wkhtmltopdf binary, located and checked once per path."""
+    return pdfkit.configuration(wkhtmltopdf=wkhtmltopdf_path or '')
+
 
 """
 Example usecase:
@@ -12,10 +21,12 @@ wkhtmltopdf_path   = r'C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe'
 
 
 pdf_generator = PdfGenerator2(html_template_path, output_pdf_path, wkhtmltopdf_path)
-pdf_generator.generate_pdf(df1)
+pdf_generator.generate_pdf([df1])
+
+# several reports can be rendered from parallel threads; nothing is written to the working directory
 """
 class PDFGenerator2:
-    def __init__(self, html_template_path, output_path, wkhtmltopdf_path):
+    def __init__(self, html_template_path, output_path, wkhtmltopdf_path=None):
         self.template = Path(html_template_path).read_text()
         self.output_path = output_path
         self.wkhtmltopdf_path = wkhtmltopdf_path
@@ -38,18 +49,16 @@ class PDFGenerator2:
             th["style"] = "font-size:10px;padding:2px;text-align:left;"
         return str(soup)
 
+    def build_html(self, dataframes, html=True):
+        if html:
+            # tables are written with their classes and cell styles already in place
+            writer = HtmlTableWriter(classes=self.classes, th_style="font-size:10px;padding:2px;text-align:left;")
+            table_html = "".join(writer.to_html(df) for df in dataframes)
+            return self.template % (writer.stylesheet() + table_html)
+        # pre-rendered HTML fragments still need their tables restyled
+        return self.modify_html(self.template % "".join(dataframes))
+
     def generate_pdf(self, dataframes,html=True):
-        table_html = ""
-        for i, df in enumerate(dataframes):
-            if html:
-                table_html = table_html+ "" + df.to_html(classes=self.classes) + ""
-            else:
-                table_html = table_html+ "" + df + ""
-        html_content = self.template % (table_html)
-        modified_html = self.modify_html(html_content)
-        html_filename = 'tmp.html'
-        with open(html_filename, "w") as f:
-            f.write(modified_html)
-
-        config = pdfkit.configuration(wkhtmltopdf=self.wkhtmltopdf_path)
-        pdfkit.from_file(html_filename, self.output_path, options=self.options, configuration=config)
\ No newline at end of file
+        # the HTML is piped to wkhtmltopdf over stdin, so concurrent reports cannot clash on a temp file
+        config = pdfkit_configuration(self.wkhtmltopdf_path)
+        pdfkit.from_string(self.build_html(dataframes, html), self.output_path, options=self.options, configuration=config)
\ No newline at end of file
@@ -0,0 +1,78 @@
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def wkhtmltopdf_args(options):
+    """pdfkit-style options dict as wkhtmltopdf command line arguments."""
+    args = []
+    for key, value in (options or {}).items():
+        args.append(key if key.startswith('-') else '--' + key)
+        if value not in (None, '', True):
+            args.append(str(value))
+    return args
+
+
+"""
+Example usecase:
+pool = PDFRenderPool(wkhtmltopdf_path=r'C:\\Program Files\\wkhtmltopdf\\bin\\wkhtmltopdf.exe', max_workers=4)
+results = pool.render([
+    (html_cash_scroll, {'page-size': 'A4'}, 'out/Cash-Scroll.pdf'),
+    (html_death, {'page-size': 'A4', 'orientation': 'Landscape'}, 'out/Death.pdf'),
+])
+failed = [r for r in results if not r['ok']]
+"""
+class PDFRenderPool:
+    """Renders a batch of (html, options, output_path) jobs with parallel wkhtmltopdf processes.
+
+    Each job pipes its HTML to its own wkhtmltopdf process over stdin, so
+    no temporary files are shared. A failing or hanging job only marks its
+    own result as failed. `wkhtmltopdf_path` may also be a command list,
+    e.g. [sys.executable, 'stub_renderer.py'] in tests.
+    """
+
+    def __init__(self, wkhtmltopdf_path=None, max_workers=None, timeout=120, default_options=None):
+        command = wkhtmltopdf_path or shutil.which('wkhtmltopdf')
+        if command is None:
+            raise FileNotFoundError("wkhtmltopdf not found. Install it or pass wkhtmltopdf_path.")
+        self.command = [command] if isinstance(command, str) else list(command)
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.default_options = {'quiet': None} if default_options is None else default_options
+
+    def render_one(self, html, options, output_path):
+        """Render a single job and return its result dict (never raises for a failed render)."""
+        start = time.perf_counter()
+        options = {**self.default_options, **(options or {})}
+        cmd = self.command + wkhtmltopdf_args(options) + ['-', output_path]
+        result = {'output_path': output_path, 'ok': False, 'returncode': None, 'error': None}
+        try:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            process = subprocess.run(cmd, input=html.encode('utf-8'), capture_output=True, timeout=self.timeout)
+            result['returncode'] = process.returncode
+            result['ok'] = process.returncode == 0
+            if not result['ok']:
+                result['error'] = process.stderr.decode('utf-8', 'replace').strip()[-2000:]
+        except subprocess.TimeoutExpired:
+            result['error'] = f"timed out after {self.timeout}s"
+        except OSError as e:
+            result['error'] = str(e)
+        result['seconds'] = time.perf_counter() - start
+        return result
+
+    def render(self, jobs):
+        """Render all jobs, return their results in job order and print a per-job timing summary."""
+        jobs = list(jobs)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            results = list(executor.map(lambda job: self.render_one(*job), jobs))
+        for result in results:
+            status = 'ok' if result['ok'] else f"FAILED ({result['error']})"
+            print(f"{os.path.basename(result['output_path'])}: {result['seconds']:.2f}s {status}")
+        n_ok = sum(result['ok'] for result in results)
+        print(f"Rendered {n_ok}/{len(results)} PDFs in {time.perf_counter() - start:.2f}s")
+        return results
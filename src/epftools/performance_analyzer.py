@@ -0,0 +1,242 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+import pdfkit
+from pathlib import Path
+
+from .daily_reporter import EXCEL_ENGINE
+from .html_table import HtmlTableWriter
+from .pdf_generator2 import pdfkit_configuration
+
+PERFORMANCE_COLUMNS = ['userid', 'Name', 'F19', 'F20', 'F31', '13-in', '13-out', '14', '10D', '10c', '5If',
+                       'others', 'total', 'annexurek']
+# sheet columns of the fields above on a user's row (Name on 3, counts from 9 on)
+PERFORMANCE_SOURCE_COLUMNS = [1, 3, 9, 10, 12, 14, 17, 18, 20, 23, 26, 28, 31, 35]
+
+def read_performance_report(path):
+    """The columns of a portal performance report (.XLS/.xlsx) that the summary uses, below its 13 title rows."""
+    columns = sorted(set(PERFORMANCE_SOURCE_COLUMNS) | {7})
+    return pd.read_excel(path, header=None, skiprows=13, usecols=columns, engine=EXCEL_ENGINE)
+
+
+def parse_performance_report(df):
+    """One row per user (PERFORMANCE_COLUMNS) from the raw report rows.
+
+    Rows with a user id in column 1 start a user; when their counts span
+    several rows, the "TOTAL-:" row below (id column empty) holds the user's
+    totals and replaces them. Only rows with a number in column 9 count.
+    """
+    df = df[pd.to_numeric(df[9], errors='coerce').notna()]
+    user_row = df[1].notna()
+    user = user_row.cumsum()
+    rows = df[(user_row | (df[7] == "TOTAL-:")) & (user > 0)]
+    # the last counting row of each user: its last TOTAL-: row, or the user row itself
+    counts = rows.groupby(user[rows.index]).tail(1)
+    ids = df.loc[user_row, [1, 3]].to_numpy()
+    summary = pd.DataFrame(counts[PERFORMANCE_SOURCE_COLUMNS[2:]].to_numpy(), columns=PERFORMANCE_COLUMNS[2:])
+    summary.insert(0, 'userid', ids[:, 0])
+    summary.insert(1, 'Name', ids[:, 1])
+    summary = summary[summary['userid'] != "UNP SVR"].reset_index(drop=True)
+    numeric = summary.drop(columns='Name').apply(pd.to_numeric, errors='coerce')
+    convertible = [column for column in numeric.columns if numeric[column].notna().all()]
+    return summary.assign(**{column: numeric[column].astype(int) for column in convertible})
+
+
+DA_STATUSES = ['Pending at DA', 'Pending at DA Accounts [EDIT]', 'Pending at DA Accounts',
+               'Pending at DA Accounts [Rejection]']
+
+
+def read_claim_snapshot(path, statuses=None):
+    """One day's claim.csv / tin.csv as (CLAIM ID, TASK ID, GROUP ID, PENDING DAYS, STATUS), sorted by CLAIM ID.
+
+    tin.csv's TRAN CLAIM ID / ACC TASK ID are renamed and its GROUP ID is
+    taken from the first three digits of the task. Only rows whose STATUS is
+    in `statuses` are kept when it is given.
+    """
+    df = pd.read_csv(path)
+    if 'ACC TASK ID' in df.columns:
+        df['GROUP ID'] = pd.to_numeric(df['ACC TASK ID'].astype(str).str[:3], errors='coerce')
+    df = df.rename(columns={'TRAN CLAIM ID': 'CLAIM ID', 'ACC TASK ID': 'TASK ID'})
+    df = df[[c for c in ['CLAIM ID', 'TASK ID', 'GROUP ID', 'PENDING DAYS', 'STATUS'] if c in df.columns]]
+    if statuses is not None:
+        df = df[df['STATUS'].isin(statuses)]
+    df = df.assign(**{'CLAIM ID': pd.to_numeric(df['CLAIM ID'], errors='coerce')}).dropna(subset=['CLAIM ID'])
+    df = df.astype({'CLAIM ID': np.int64}).sort_values('CLAIM ID', kind='stable')
+    return df.drop_duplicates('CLAIM ID').reset_index(drop=True)
+
+
+def sorted_lookup(values, sorted_ids):
+    """Position of each value in the sorted int64 array sorted_ids, and whether it is there at all."""
+    positions = np.searchsorted(sorted_ids, values)
+    found = positions < len(sorted_ids)
+    found[found] = sorted_ids[positions[found]] == values[found]
+    return positions, found
+
+
+def sorted_membership(values, sorted_ids):
+    """Boolean mask of which values occur in the sorted int64 array sorted_ids (one searchsorted)."""
+    return sorted_lookup(values, sorted_ids)[1]
+
+
+"""
+Example usecase:
+comparer = SnapshotComparer('reports/')                  # reports/2023_06_13/claim.csv, ...
+diff = comparer.compare('2023_06_13', '2023_06_14')
+diff['cleared'], diff['new'], diff['carried']
+for earlier, later, diff in comparer.rolling(comparer.dates()[-30:]):
+    print(earlier, later, len(diff['cleared']))
+"""
+class SnapshotComparer:
+    """Day-over-day claim set differences between dated snapshot folders.
+
+    Each day's file is read once and kept sorted by CLAIM ID; every
+    comparison is then a searchsorted of one day's ids into the other's,
+    instead of a merge. A rolling window over N days reads N snapshots.
+    """
+
+    DATE_PATTERN = re.compile(r'^\d{4}_\d{2}_\d{2}$')
+
+    def __init__(self, directory_path, statuses=DA_STATUSES):
+        self.directory_path = directory_path
+        self.statuses = statuses
+        self._snapshots = {}
+
+    def dates(self):
+        """Snapshot folder names (YYYY_MM_DD) in date order."""
+        return sorted(name for name in os.listdir(self.directory_path)
+                      if self.DATE_PATTERN.match(name) and os.path.isdir(os.path.join(self.directory_path, name)))
+
+    def snapshot(self, date, fname='claim.csv'):
+        if (date, fname) not in self._snapshots:
+            path = os.path.join(self.directory_path, date, fname)
+            self._snapshots[(date, fname)] = read_claim_snapshot(path, self.statuses)
+        return self._snapshots[(date, fname)]
+
+    def release(self, date, fname='claim.csv'):
+        self._snapshots.pop((date, fname), None)
+
+    def compare(self, earlier, later, fname='claim.csv'):
+        """{'cleared': rows of earlier gone by later, 'new': rows only in later, 'carried': earlier rows still pending}."""
+        before, after = self.snapshot(earlier, fname), self.snapshot(later, fname)
+        still_pending = sorted_membership(before['CLAIM ID'].to_numpy(), after['CLAIM ID'].to_numpy())
+        seen_before = sorted_membership(after['CLAIM ID'].to_numpy(), before['CLAIM ID'].to_numpy())
+        return {'cleared': before[~still_pending], 'new': after[~seen_before], 'carried': before[still_pending]}
+
+    def rolling(self, dates=None, fname='claim.csv'):
+        """(earlier, later, diff) for each consecutive pair of dates; each snapshot is read once."""
+        dates = self.dates() if dates is None else list(dates)
+        for earlier, later in zip(dates, dates[1:]):
+            yield earlier, later, self.compare(earlier, later, fname)
+            self.release(earlier, fname)
+
+
+def count_by_task(df, column):
+    """Claims per (GROUP, TASK) with an 'All' total row, as columns GROUP, TASK, column."""
+    counts = df.groupby(['GROUP ID', 'TASK ID']).size()
+    counts = counts.rename(column).rename_axis(['GROUP', 'TASK']).reset_index()
+    total = pd.DataFrame({'GROUP': ['All'], 'TASK': [''], column: [len(df)]})
+    return pd.concat([counts.astype({'GROUP': object, 'TASK': object}), total], ignore_index=True)
+
+
+def heat_css(df, columns):
+    """Red background, darker for larger counts, for 7 < value < 65 in the given columns."""
+    css = np.full(df.shape, '', dtype=object)
+    for i, column in enumerate(df.columns):
+        if column in columns:
+            values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            intensity = 100 + (55 * np.nan_to_num(values) / 50).astype(int)
+            hot = (values > 7) & (values < 65)
+            css[hot, i] = [f'background-color: rgb(255, {v}, {v});font-weight:bold;' for v in intensity[hot]]
+    return css
+
+
+"""
+Example usecase:
+analyzer = PerformanceAnalyzer('reports/', 'templates/template.html', wkhtmltopdf_path)
+analyzer.compare_claims('2023_06_14', '2023_06_13')       # DA claims cleared since 2023_06_13
+analyzer.get_date_compared('2023_06_13', '2023_06_14', 'tin.csv')
+analyzer.generate_performance_report()                     # one PDF per day and a summary
+"""
+class PerformanceAnalyzer:
+    def __init__(self, directory_path, template_path, wkhtmltopdf_path=None):
+        self.directory_path = directory_path
+        self.template = Path(template_path).read_text()
+        self.wkhtmltopdf_path = wkhtmltopdf_path
+        self.comparer = SnapshotComparer(directory_path)
+        self.options = {
+            'page-size': 'A4',
+            'orientation': 'Portrait',
+            'margin-top': '0.2in',
+            'margin-right': '0.2in',
+            'margin-bottom': '0.2in',
+            'margin-left': '0.2in'
+        }
+
+    def compare_claims(self, date1, date2):
+        """DA claims pending on date2 (earlier) that were cleared by date1 (later), per GROUP and TASK."""
+        return count_by_task(self.comparer.compare(date2, date1, 'claim.csv')['cleared'], date2)
+
+    def get_date_compared(self, date1, date2, fname):
+        """DA claims in fname on date1 that are gone on date2, as column '<file>_<date1>'."""
+        return count_by_task(self.comparer.compare(date1, date2, fname)['cleared'], fname[:-4] + "_" + date1)
+
+    def make_html(self, df, title_string='', columns=()):
+        writer = HtmlTableWriter(classes='table table-bordered border-primary',
+                                 td_style='font-size:9px;padding:2px;text-align:center;',
+                                 th_style='font-size:9px;padding:2px;text-align:center;background:#ddd;')
+        table = writer.to_html(df.set_index(df.columns[0]), heat_css(df, columns)[:, 1:])
+        return self.template % (writer.stylesheet() + f"<h5>Processed at DA level: {title_string} </h5>" + table)
+
+    def make_pdf(self, df, fname, title_string='', columns=()):
+        kwargs = {'options': self.options}
+        if self.wkhtmltopdf_path:
+            kwargs['configuration'] = pdfkit_configuration(self.wkhtmltopdf_path)
+        pdfkit.from_string(self.make_html(df, title_string, columns), fname, **kwargs)
+        print(fname + " generated.")
+
+    @staticmethod
+    def summarize_performance_excel(path, flag=0, mapping_file=None):
+        """Per-user totals of a DA or AO performance report, optionally joined with mapping_file (userid -> group).
+
+        With flag=1 users are sorted by group and then total, otherwise by total.
+        """
+        summary = parse_performance_report(read_performance_report(path))
+        if flag:
+            summary = summary.merge(pd.read_excel(mapping_file), how='left', on='userid')
+            return summary.sort_values(['group', 'total'], ascending=[True, False])
+        return summary.sort_values('total', ascending=False)
+
+    def generate_performance_summary(self, da_file, ao_file, mapping_file, output_path=None):
+        """PDF of the DA report (grouped with mapping_file) and the AO report."""
+        output_path = output_path or os.path.join(self.directory_path, "Performance_summary.pdf")
+        writer = HtmlTableWriter(classes='table table-hover table-bordered border-primary d-print-table')
+        da = writer.to_html(self.summarize_performance_excel(da_file, flag=1, mapping_file=mapping_file))
+        ao = writer.to_html(self.summarize_performance_excel(ao_file))
+        html = self.template % (writer.stylesheet() + "<h2>DA performance</h2>" + da + "<br/>" +
+                                "<h2>Approver Performance</h2>" + ao + "<br/>")
+        kwargs = {'options': self.options}
+        if self.wkhtmltopdf_path:
+            kwargs['configuration'] = pdfkit_configuration(self.wkhtmltopdf_path)
+        pdfkit.from_string(html, output_path, **kwargs)
+        print(output_path + " generated.")
+        return output_path
+
+    def generate_performance_report(self, dates=None):
+        """A PDF of DA claims cleared on each day, and a summary with one column per day."""
+        dates = self.comparer.dates() if dates is None else list(dates)
+        daily = []
+        for earlier, later, diff in self.comparer.rolling(dates, 'claim.csv'):
+            df = count_by_task(diff['cleared'], earlier)
+            daily.append(df[df['GROUP'] != 'All'].set_index(['GROUP', 'TASK']))
+            self.make_pdf(df, os.path.join(self.directory_path, earlier + "_performance_da.pdf"),
+                          title_string=earlier + " - " + later, columns=[earlier])
+        if not daily:
+            print("Need at least two dated folders to compare.")
+            return None
+        result = pd.concat(daily, axis=1).fillna(0).astype(int).reset_index()
+        result['TASK'] = result['TASK'].astype(str)
+        result = result.sort_values('TASK')
+        output_path = os.path.join(self.directory_path, dates[-1] + "_summary.pdf")
+        self.make_pdf(result, output_path, columns=[c for c in result.columns if re.search(r"\d{4}", str(c))])
+        return output_path
@@ -0,0 +1,129 @@
+import re
+import numpy as np
+import pandas as pd
+
+
+"""
+Example usecase:
+matcher = ReasonMatcher.from_csv('reason_category.csv')
+matcher.match(['15G NOT SUBMITED', 'CHEQUE NOT CLAER'], k=3)        # candidates with scores
+matcher.categorize(reasons['reason_text'], min_score=0.4)          # standalone categorizer
+"""
+class ReasonMatcher:
+    """Character n-gram inverted index over labelled rejection reasons.
+
+    Misspellings share most of their n-grams with the correct spelling, so
+    'SUBMITED' still lands next to 'SUBMITTED'. Scores are the cosine
+    similarity of the two n-gram sets, computed for a whole batch of queries
+    with one bincount over the posting lists.
+    """
+
+    NON_ALNUM = re.compile(r'[^A-Z0-9]+')
+
+    def __init__(self, n=3, batch_size=2048):
+        self.n = n
+        self.batch_size = batch_size
+        self.vocabulary = {}
+        self.reasons = np.array([], dtype=object)
+        self.categories = np.array([], dtype=object)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.postings = np.array([], dtype=np.int64)
+        self.doc_sizes = np.array([], dtype=np.float64)
+
+    def _normalize(self, text):
+        if not isinstance(text, str):
+            return ''
+        return self.NON_ALNUM.sub(' ', text.upper()).strip()
+
+    def _ngrams(self, text):
+        text = ' ' + self._normalize(text) + ' '
+        return {text[i:i + self.n] for i in range(len(text) - self.n + 1)}
+
+    def fit(self, reasons, categories=None):
+        reasons = pd.Series(reasons, dtype=object).fillna('')
+        # a refit starts from an empty vocabulary, so n-grams of the old reasons do not linger
+        self.vocabulary = {}
+        self.reasons = reasons.to_numpy()
+        self.categories = (pd.Series(categories, dtype=object).to_numpy()
+                           if categories is not None else np.full(len(reasons), None, dtype=object))
+        gram_ids, doc_ids, sizes = [], [], []
+        for doc, text in enumerate(self.reasons):
+            grams = self._ngrams(text)
+            sizes.append(len(grams))
+            for gram in grams:
+                gram_ids.append(self.vocabulary.setdefault(gram, len(self.vocabulary)))
+                doc_ids.append(doc)
+        gram_ids = np.asarray(gram_ids, dtype=np.int64)
+        order = np.argsort(gram_ids, kind='stable')
+        self.postings = np.asarray(doc_ids, dtype=np.int64)[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(gram_ids, minlength=len(self.vocabulary)))])
+        self.doc_sizes = np.asarray(sizes, dtype=np.float64)
+        return self
+
+    @classmethod
+    def from_csv(cls, path, reason_column='reason', category_column='category', **kwargs):
+        df = pd.read_csv(path)
+        return cls(**kwargs).fit(df[reason_column], df[category_column])
+
+    def _scores(self, queries):
+        """Dense (len(queries), n_reasons) cosine similarity matrix."""
+        query_rows, gram_ids, query_sizes = [], [], np.zeros(len(queries))
+        for row, text in enumerate(queries):
+            grams = self._ngrams(text)
+            query_sizes[row] = len(grams)
+            for gram in grams:
+                gram_id = self.vocabulary.get(gram)
+                if gram_id is not None:
+                    query_rows.append(row)
+                    gram_ids.append(gram_id)
+        query_rows = np.asarray(query_rows, dtype=np.int64)
+        gram_ids = np.asarray(gram_ids, dtype=np.int64)
+
+        # expand every (query, gram) pair into the gram's posting list without a Python loop
+        starts = self.indptr[gram_ids]
+        lengths = self.indptr[gram_ids + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        keys = np.repeat(query_rows, lengths) * len(self.reasons) + self.postings[offsets]
+
+        n_docs = len(self.reasons)
+        overlap = np.bincount(keys, minlength=len(queries) * n_docs).reshape(len(queries), n_docs)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = overlap / np.sqrt(np.outer(query_sizes, self.doc_sizes))
+        return np.nan_to_num(scores)
+
+    def top_k(self, queries, k=5):
+        """Return (indices, scores) arrays of shape (len(queries), k), best match first."""
+        # rejection reasons repeat heavily, so score each distinct text once
+        codes, queries = pd.factorize(pd.Series(list(queries), dtype=object), use_na_sentinel=False)
+        queries = list(queries)
+        k = min(k, len(self.reasons))
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        scores = np.empty((len(queries), k), dtype=np.float64)
+        for start in range(0, len(queries), self.batch_size):
+            batch = self._scores(queries[start:start + self.batch_size])
+            best = np.argpartition(-batch, k - 1, axis=1)[:, :k]
+            best_scores = np.take_along_axis(batch, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind='stable')
+            indices[start:start + len(batch)] = np.take_along_axis(best, order, axis=1)
+            scores[start:start + len(batch)] = np.take_along_axis(best_scores, order, axis=1)
+        return indices[codes], scores[codes]
+
+    def match(self, queries, k=5):
+        """Long DataFrame of the k nearest labelled reasons for each query."""
+        queries = list(queries)
+        indices, scores = self.top_k(queries, k)
+        flat = indices.ravel()
+        return pd.DataFrame({
+            'query_no': np.repeat(np.arange(len(queries)), indices.shape[1]),
+            'rank': np.tile(np.arange(1, indices.shape[1] + 1), len(queries)),
+            'reason': self.reasons[flat],
+            'category': self.categories[flat],
+            'score': scores.ravel(),
+        })
+
+    def categorize(self, queries, min_score=0.0):
+        """Category of the best match per query; None where nothing scores above `min_score`."""
+        indices, scores = self.top_k(queries, k=1)
+        categories = self.categories[indices[:, 0]].copy()
+        categories[(scores[:, 0] <= 0) | (scores[:, 0] < min_score)] = None
+        return pd.DataFrame({'predicted_category': categories, 'similarity': scores[:, 0]})
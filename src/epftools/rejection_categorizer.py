@@ -0,0 +1,192 @@
+import re
+import pickle
+import numpy as np
+import pandas as pd
+
+try:
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.linear_model import SGDClassifier
+except ImportError:  # scikit-learn is an optional dependency (epftools[ml])
+    HashingVectorizer = None
+    SGDClassifier = None
+
+
+# "1) PAN NOT SEEDED 2) CHEQUE NOT CLEAR" -> one match per candidate number. The number must
+# start the text or follow whitespace, so "FY 2023-24)" and "AGE (58)" are not candidates.
+REASON_PATTERN = re.compile(r'(?<!\S)(\d{1,2})\)')
+
+
+def _split_numbered(text):
+    """[(reason_no, reason_text)] of one reason text, or [] when it does not start with a number.
+
+    After the first reason a number only starts a new one when it continues
+    the sequence and is not inside an open parenthesis, as in
+    "1) BANK (SEE ANNEX 2) ) 2) PAN NOT SEEDED".
+    """
+    starts = []
+    for match in REASON_PATTERN.finditer(text):
+        number = int(match.group(1))
+        if not starts:
+            if match.start() != 0:
+                return []
+        else:
+            last_no, last_end, _ = starts[-1]
+            between = text[last_end:match.start()]
+            if number != last_no + 1 or between.count('(') > between.count(')'):
+                continue
+        starts.append((number, match.end(), match.start()))
+    ends = [start for _, _, start in starts[1:]] + [len(text)]
+    return [(number, text[begin:end].strip(' ,.;')) for (number, begin, _), end in zip(starts, ends)]
+
+
+def split_reject_reasons(df, reason_column='REJECT_REASON', id_column='CLAIM_ID'):
+    """Explode numbered rejection reasons into a long (id, reason_no, reason_text) table.
+
+    All reasons are kept, not just the first two, and reason_no is the number
+    written before each one. Text without numbering is treated as reason 1.
+    Each distinct text is parsed once, and reason_text is categorical so that
+    repeated reasons are stored (and categorized) once.
+    """
+    text = df[reason_column].reset_index(drop=True).astype('string').str.replace(r'\s+', ' ', regex=True).str.strip()
+    ids = df[id_column].to_numpy()
+
+    codes, uniques = pd.factorize(text)
+    parsed = [_split_numbered(t) or [(1, t.strip(' ,.;'))] for t in uniques]
+    counts = np.array([len(reasons) for reasons in parsed], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+    numbers = np.array([number for reasons in parsed for number, _ in reasons], dtype=np.int64)
+    texts = np.array([reason for reasons in parsed for _, reason in reasons], dtype=object)
+
+    rows = np.flatnonzero(codes >= 0)
+    per_row = counts[codes[rows]]
+    position = np.repeat(rows, per_row)
+    # index of each output row into the flattened (numbers, texts) of its text
+    within = np.arange(per_row.sum()) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+    reason = np.repeat(offsets[codes[rows]], per_row) + within
+
+    long_df = pd.DataFrame({
+        id_column: ids[position],
+        'reason_no': numbers[reason],
+        'reason_text': texts[reason],
+    })
+    long_df = long_df[long_df['reason_text'] != '']
+    long_df['reason_text'] = long_df['reason_text'].astype('category')
+    return long_df.reset_index(drop=True)
+
+
+"""
+Example usecase:
+reasons = split_reject_reasons(dall[dall['outcome'] == 'rejected'])
+categorizer = RejectionCategorizer()
+categorizer.train(pd.read_csv('reason_category.csv'), reason_column='reason', category_column='category')
+categorizer.save_model('rejection_model.pkl')
+
+# later, when staff label another batch
+categorizer = RejectionCategorizer.load_model('rejection_model.pkl')
+categorizer.update(new_labels, reason_column='reason', category_column='category')
+categorizer.save_model('rejection_model.pkl')
+
+reasons = categorizer.categorize(reasons, reason_column='reason_text')
+"""
+class RejectionCategorizer:
+    """Categorizes free-text rejection reasons.
+
+    The vectorizer is a stateless HashingVectorizer, so there is no vocabulary
+    to refit and newly labelled rows can be folded into the model with
+    `update` (SGDClassifier.partial_fit) in time proportional to the new rows.
+    """
+
+    def __init__(self, n_features=2 ** 18, ngram_range=(1, 2), alpha=1e-4, epochs=5, random_state=0):
+        if HashingVectorizer is None:
+            raise ImportError("RejectionCategorizer requires scikit-learn: pip install epftools[ml]")
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.alpha = alpha
+        self.epochs = epochs
+        self.random_state = random_state
+        self.vectorizer = HashingVectorizer(n_features=n_features, ngram_range=ngram_range,
+                                            alternate_sign=False, norm='l2')
+        self.model = None
+        self.classes = None
+        self.version = 0
+        self.n_samples_seen = 0
+
+    @staticmethod
+    def _clean(reasons):
+        return pd.Series(reasons, dtype=object).fillna('').astype(str).str.strip().tolist()
+
+    def _new_model(self):
+        return SGDClassifier(loss='log_loss', alpha=self.alpha, random_state=self.random_state)
+
+    def _partial_fit(self, reasons, categories, epochs):
+        X = self.vectorizer.transform(reasons)
+        y = np.asarray(categories, dtype=object)
+        rng = np.random.default_rng(self.random_state + self.version)
+        for _ in range(epochs):
+            order = rng.permutation(len(y))
+            self.model.partial_fit(X[order], y[order], classes=self.classes)
+        self.n_samples_seen += len(y)
+        self.version += 1
+
+    def train(self, df, reason_column='reason', category_column='category', classes=None):
+        """Fit a fresh model on `df`.
+
+        Pass `classes` to declare categories that are not yet present in the
+        labelled data so that later `update` calls may use them.
+        """
+        reasons = self._clean(df[reason_column])
+        categories = self._clean(df[category_column])
+        self.classes = np.array(sorted(set(categories) | set(classes or [])), dtype=object)
+        self.model = self._new_model()
+        self.n_samples_seen = 0
+        self._partial_fit(reasons, categories, self.epochs)
+        return self
+
+    def update(self, df, reason_column='reason', category_column='category', epochs=1):
+        """Fold newly labelled rows into the existing model without retraining."""
+        if self.model is None:
+            return self.train(df, reason_column, category_column)
+        categories = self._clean(df[category_column])
+        unknown = sorted(set(categories) - set(self.classes))
+        if unknown:
+            raise ValueError(f"Unknown categories {unknown}; retrain with train(..., classes=[...]) to add them")
+        self._partial_fit(self._clean(df[reason_column]), categories, epochs)
+        return self
+
+    def predict(self, reasons):
+        if self.model is None:
+            raise ValueError("Model is not trained; call train() or load_model() first")
+        return self.model.predict(self.vectorizer.transform(self._clean(reasons)))
+
+    def predict_proba(self, reasons):
+        if self.model is None:
+            raise ValueError("Model is not trained; call train() or load_model() first")
+        return self.model.predict_proba(self.vectorizer.transform(self._clean(reasons)))
+
+    def categorize(self, df, reason_column='reason1'):
+        """Return a copy of `df` with predicted_category, confidence and model_version columns."""
+        df = df.copy()
+        reasons = df[reason_column]
+        if isinstance(reasons.dtype, pd.CategoricalDtype):
+            # score each distinct reason once; the trailing blank row serves code -1 (missing)
+            probabilities = self.predict_proba(list(reasons.cat.categories) + [''])
+            probabilities = probabilities[reasons.cat.codes.to_numpy()]
+        else:
+            probabilities = self.predict_proba(reasons)
+        df['predicted_category'] = self.model.classes_[probabilities.argmax(axis=1)]
+        df['confidence'] = probabilities.max(axis=1)
+        df['model_version'] = self.version
+        return df
+
+    def save_model(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+        print(f"Model version {self.version} saved to {path}")
+
+    @classmethod
+    def load_model(cls, path):
+        with open(path, 'rb') as f:
+            categorizer = pickle.load(f)
+        if not isinstance(categorizer, cls):
+            raise TypeError(f"{path} does not contain a {cls.__name__}")
+        return categorizer
@@ -0,0 +1,165 @@
+import pandas as pd
+
+from .listing_engine import ListingEngine
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+# scheme -> (bin edges, labels); edges are right-closed, so 20 falls in 'Upto 20 Days'
+PENDING_BINS = {
+    2: ([-1, 20, 2000], ['Upto 20 Days', 'More than 20 Days']),
+    3: ([-1, 15, 20, 3000], ['<=15 Days', '16-20 Days', '>20 Days']),
+    4: ([-1, 10, 5000], ['<=10 Days', '>10 Days']),
+    5: ([-1, 20, 100, 5000], ['<=20 Days', '21-100 Days', '>100 Days']),
+}
+
+
+def pending_bins(days, scheme=2):
+    """Categorical pendency bucket of each PENDING DAYS value."""
+    bins, labels = PENDING_BINS[scheme]
+    return pd.cut(days, bins=bins, labels=labels)
+
+
+def count_pivot(df, values, index, columns):
+    """Margined count pivot as ints; an empty frame when nothing is left to count."""
+    if df.empty:
+        return pd.DataFrame()
+    pivot = pd.pivot_table(df, values=values, index=index, columns=columns,
+                           margins=True, aggfunc='count', observed=True)
+    return pivot.fillna(0).astype(int)
+
+
+"""
+Example usecase:
+plan = ReportPlan([
+    {'name': 'claims',      'source': 'claim', 'bins': 2, 'index': ['cat']},
+    {'name': 'claims_20',   'source': 'claim', 'min_days': 20, 'index': ['STATUS']},
+    {'name': 'da_wise',     'source': 'claim', 'min_days': 0, 'status': ['DA(Includes NTE)'], 'bins': 4,
+     'index': ['GROUP ID', 'TASK ID'], 'columns': ['cat']},
+])
+plan = ReportPlan.from_yaml('daily_report.yaml')
+print(plan.describe())
+pivots = plan.execute(registry)          # {'claims': DataFrame, ...}
+plan.listings['claims_20']               # the rows counted in that table
+"""
+class ReportPlan:
+    """Compiles a list of table specs into shared load, filter, bin and pivot steps.
+
+    A table spec is a dict with
+        name      attribute / key of the resulting pivot (required)
+        source    registry source name (required)
+        title     heading in the report (defaults to name)
+        min_days  keep rows with PENDING DAYS > min_days
+        status    keep rows whose STATUS is in this list
+        bins      PENDING_BINS scheme stored as column 'cat'
+        values    column counted (defaults to the source's first column)
+        index     pivot rows (columns the source lacks are dropped)
+        columns   pivot columns (default ['Officer', 'GROUP ID'])
+        highlight threshold for highlighting, or {'top': n, 'column': c}
+        page_break  start a new page after this table
+    Every distinct source, filter, binning and pivot is computed once no
+    matter how many tables use it.
+    """
+
+    DEFAULT_COLUMNS = ['Officer', 'GROUP ID']
+
+    def __init__(self, tables):
+        self.tables = [self._normalize(table) for table in tables]
+        self.sources = list(dict.fromkeys(t['source'] for t in self.tables))
+        self.filters = list(dict.fromkeys(self._filter_key(t) for t in self.tables))
+        self.conditions = list(dict.fromkeys(c for key in self.filters for c in self._conditions(key)))
+        self.binnings = list(dict.fromkeys((t['source'], t['bins']) for t in self.tables if t['bins']))
+        self.pivots = list(dict.fromkeys(self._pivot_key(t) for t in self.tables))
+        self.stats = {}
+        self.engines = {}
+        self.listings = {}
+
+    @classmethod
+    def from_yaml(cls, path):
+        """Plan from a YAML file holding a list of table specs (or {'tables': [...]})."""
+        if yaml is None:
+            raise ImportError("Reading report specs from YAML needs PyYAML. Install it with: pip install epftools[yaml]")
+        with open(path) as f:
+            spec = yaml.safe_load(f)
+        return cls(spec['tables'] if isinstance(spec, dict) else spec)
+
+    @classmethod
+    def _normalize(cls, table):
+        missing = {'name', 'source'} - set(table)
+        if missing:
+            raise ValueError(f"Table spec {table} is missing {', '.join(sorted(missing))}")
+        table = dict(table)
+        table.setdefault('title', table['name'])
+        table.setdefault('min_days', None)
+        table['status'] = tuple(table['status']) if table.get('status') else None
+        table.setdefault('bins', None)
+        table.setdefault('values', None)
+        table['index'] = tuple(table.get('index', ['cat']))
+        table['columns'] = tuple(table.get('columns', cls.DEFAULT_COLUMNS))
+        table.setdefault('highlight', None)
+        table.setdefault('page_break', False)
+        if table['bins'] is not None and table['bins'] not in PENDING_BINS:
+            raise ValueError(f"Unknown bin scheme {table['bins']}; choose from {sorted(PENDING_BINS)}")
+        return table
+
+    @staticmethod
+    def _filter_key(table):
+        return table['source'], table['min_days'], table['status']
+
+    @staticmethod
+    def _conditions(filter_key):
+        source, min_days, status = filter_key
+        conditions = []
+        if min_days is not None:
+            conditions.append((source, 'min_days', min_days))
+        if status is not None:
+            conditions.append((source, 'status', status))
+        return conditions
+
+    def _pivot_key(self, table):
+        return self._filter_key(table), table['bins'], table['values'], table['index'], table['columns']
+
+    def describe(self):
+        return (f"{len(self.tables)} tables -> {len(self.sources)} loads, {len(self.conditions)} filter conditions, "
+                f"{len(self.binnings)} binnings, {len(self.pivots)} pivots")
+
+    def execute(self, registry):
+        """Run the plan against a SourceRegistry and return {name: pivot}.
+
+        The filtered rows behind each table are kept in `listings` by name,
+        sorted by TASK ID and then oldest first; `engines` holds the
+        ListingEngine of each source for further worklists.
+        """
+        # each source is sorted once into worklist order; every condition is evaluated once on
+        # it and each table's rows are a position array into the sorted frame
+        self.engines = {source: ListingEngine(registry.get(source)) for source in self.sources}
+        frames = {source: engine.sorted for source, engine in self.engines.items()}
+        rows = {}
+        for key in self.filters:
+            source, min_days, status = key
+            rows[key] = self.engines[source].select(status=status, min_days=min_days)
+        binned = {(source, scheme): pending_bins(frames[source]['PENDING DAYS'], scheme)
+                  for source, scheme in self.binnings if 'PENDING DAYS' in frames[source].columns}
+
+        selections = {}
+        pivots = {}
+        for key in self.pivots:
+            filter_key, scheme, values, index, columns = key
+            source = filter_key[0]
+            if (filter_key, scheme) not in selections:
+                df = frames[source]
+                if (source, scheme) in binned:
+                    df = df.assign(cat=binned[(source, scheme)])
+                selections[(filter_key, scheme)] = df.iloc[rows[filter_key]]
+            df = selections[(filter_key, scheme)]
+            values = values or frames[source].columns[0]
+            pivots[key] = count_pivot(df, values, [c for c in index if c in df.columns], list(columns))
+
+        conditions = sum(len(engine.conditions) for engine in self.engines.values())
+        self.stats = {'tables': len(self.tables), 'loads': len(frames), 'conditions': conditions,
+                      'binnings': len(binned), 'selections': len(selections), 'pivots': len(pivots)}
+        self.listings = {table['name']: selections[(self._filter_key(table), table['bins'])] for table in self.tables}
+        return {table['name']: pivots[self._pivot_key(table)] for table in self.tables}
@@ -0,0 +1,220 @@
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def _file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sidecar_paths(path, cache_dir):
+    base = os.path.join(cache_dir, os.path.basename(path))
+    return base + '.parquet', base + '.json'
+
+
+def _loader_version(loader):
+    """The loader's cache_version attribute (a value or a callable returning one), if it has one.
+
+    Loaders that derive columns from tables outside the source file (group
+    officers, status bins) set it so a sidecar is not reused after those change.
+    """
+    version = getattr(loader, 'cache_version', None)
+    return repr(version() if callable(version) else version)
+
+
+def _sidecar_key(loader, kwargs):
+    return {'loader': f'{loader.__module__}.{loader.__qualname__}', 'kwargs': repr(sorted(kwargs.items())),
+            'version': _loader_version(loader)}
+
+
+def _read_sidecar_meta(path, loader, kwargs, cache_dir):
+    data_path, meta_path = _sidecar_paths(path, cache_dir)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    return meta if meta.get('key') == _sidecar_key(loader, kwargs) else None
+
+
+def sidecar_is_fresh(path, loader, kwargs, cache_dir):
+    """True when the sidecar matches the source's size and mtime (no hashing)."""
+    if cache_dir is None or pyarrow is None:
+        return False
+    meta = _read_sidecar_meta(path, loader, kwargs, cache_dir)
+    stat = os.stat(path)
+    return meta is not None and (meta['size'], meta['mtime_ns']) == (stat.st_size, stat.st_mtime_ns)
+
+
+def load_with_sidecar(loader, path, kwargs, cache_dir):
+    """Loaded frame and whether it came from the Parquet sidecar in `cache_dir`.
+
+    The sidecar is used when size and mtime match, or when only the mtime
+    changed but the content hash is the same (the same file downloaded again).
+    Otherwise the loader runs and the sidecar is rewritten.
+    """
+    data_path, meta_path = _sidecar_paths(path, cache_dir)
+    stat = os.stat(path)
+    meta = _read_sidecar_meta(path, loader, kwargs, cache_dir)
+    digest = None
+    if meta is not None and meta['size'] == stat.st_size:
+        if meta['mtime_ns'] != stat.st_mtime_ns:
+            digest = _file_digest(path)
+        if digest is None or digest == meta['hash']:
+            if digest is not None:
+                meta['mtime_ns'] = stat.st_mtime_ns
+                _write_json(meta_path, meta)
+            return pd.read_parquet(data_path), True
+
+    frame = loader(path, **kwargs)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        frame.to_parquet(data_path, index=False)
+    except (ValueError, TypeError) as e:
+        print(f"Not caching {os.path.basename(path)}: {e}")
+        return frame, False
+    _write_json(meta_path, {'key': _sidecar_key(loader, kwargs), 'size': stat.st_size,
+                            'mtime_ns': stat.st_mtime_ns, 'hash': digest or _file_digest(path)})
+    return frame, False
+
+
+def _write_json(path, data):
+    with open(path + '.tmp', 'w') as f:
+        json.dump(data, f)
+    os.replace(path + '.tmp', path)
+
+
+def _timed_load(loader, path, kwargs, cache_dir=None):
+    start = time.perf_counter()
+    if cache_dir is not None and pyarrow is not None:
+        frame, cached = load_with_sidecar(loader, path, kwargs, cache_dir)
+    else:
+        frame, cached = loader(path, **kwargs), False
+    return frame, time.perf_counter() - start, cached
+
+
+"""
+Example usecase:
+registry = SourceRegistry()
+registry.register('claim', 'downloads/Claim.csv', load_claim_csv)
+registry.register('dsc', 'downloads/dsc.xlsx', load_pendency_excel)
+df_claim = registry.get('claim')      # read and normalized on first use
+df_claim = registry.get('claim')      # same frame, no re-read
+
+if __name__ == '__main__':           # needed on Windows, xlsx sources load in worker processes
+    frames = registry.load_all()      # prints the load time of every source
+"""
+class SourceRegistry:
+    """Named input files that are each loaded and normalized exactly once.
+
+    A loader is a module-level function `loader(path, **kwargs)` returning a
+    DataFrame. Every consumer of a source gets the same cached frame, so
+    builders must derive new frames from it (assign, boolean indexing)
+    rather than modify it in place.
+
+    load_all() reads the sources concurrently: text files on threads (the
+    parsers release the GIL) and spreadsheets in worker processes, since
+    xlsx parsing is pure Python. Loaders must therefore be picklable.
+
+    With a `cache_dir`, spreadsheet sources are also kept as normalized
+    Parquet sidecars there, so re-runs on the same downloads skip the xlsx
+    parser entirely. Needs pyarrow; without it caching is skipped.
+    """
+
+    PROCESS_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._sources = {}
+        self._frames = {}
+        self.load_times = {}
+        self.cached = set()
+
+    def register(self, name, path, loader, **kwargs):
+        self._sources[name] = (path, loader, kwargs)
+        self._frames.pop(name, None)
+
+    @property
+    def names(self):
+        return list(self._sources)
+
+    def __contains__(self, name):
+        return name in self._sources
+
+    def path(self, name):
+        return self._sources[name][0]
+
+    def is_loaded(self, name):
+        return name in self._frames
+
+    def get(self, name):
+        if name not in self._frames:
+            if name not in self._sources:
+                raise KeyError(f"Unknown source '{name}'. Registered: {', '.join(self._sources)}")
+            path, loader, kwargs = self._sources[name]
+            self._check_exists(name, path)
+            self._store(name, _timed_load(loader, path, kwargs, self._cache_dir_for(name)))
+        return self._frames[name]
+
+    def _is_spreadsheet(self, name):
+        return self._sources[name][0].lower().endswith(self.PROCESS_EXTENSIONS)
+
+    def _cache_dir_for(self, name):
+        return self.cache_dir if self._is_spreadsheet(name) else None
+
+    def _store(self, name, result):
+        self._frames[name], self.load_times[name], cached = result
+        if cached:
+            self.cached.add(name)
+
+    def _check_exists(self, name, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Source '{name}' not found at {path}")
+
+    def load_all(self, max_workers=None, parallel=True, names=None):
+        """Load every source (or just `names`) not loaded yet, concurrently, and print per-source load times."""
+        names = self.names if names is None else list(names)
+        pending = [name for name in names if name not in self._frames]
+        if not parallel or len(pending) <= 1:
+            for name in pending:
+                self.get(name)
+        else:
+            for name in pending:
+                self._check_exists(name, self._sources[name][0])
+            # fresh sidecars are a quick Parquet read, not worth a worker process
+            in_process = [n for n in pending if self._is_spreadsheet(n)
+                          and not sidecar_is_fresh(*self._sources[n], self.cache_dir)]
+            threads = ThreadPoolExecutor(max_workers)
+            processes = ProcessPoolExecutor(max_workers) if in_process else None
+            try:
+                futures = {}
+                for name in pending:
+                    path, loader, kwargs = self._sources[name]
+                    pool = processes if name in in_process else threads
+                    futures[name] = pool.submit(_timed_load, loader, path, kwargs, self._cache_dir_for(name))
+                for name, future in futures.items():
+                    self._store(name, future.result())
+            finally:
+                threads.shutdown()
+                if processes is not None:
+                    processes.shutdown()
+        for name in pending:
+            source = os.path.basename(self._sources[name][0])
+            print(f"Loaded {name} ({source}) in {self.load_times[name]:.2f}s" + (" [cache]" if name in self.cached else ""))
+        return {name: self.get(name) for name in names}
+
+    def clear(self):
+        self._frames.clear()
+        self.load_times.clear()
+        self.cached.clear()
@@ -0,0 +1,118 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from .estmst_analyzer import EstmstAnalyzer, EstmstCube
+
+
+"""
+Example usecase:
+from epftools.visualization import plot_establishment_trends
+
+df = EstmstAnalyzer().analyze_multiple_estmst_files({'2016': '2016.csv', '12months': '12months.csv'})
+fig = plot_establishment_trends(df, metric='MEMBER', top_n=200, max_points=20000)
+fig.show()
+"""
+
+
+def lttb_downsample(x, y, n_out):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point that forms the largest triangle with the point
+    kept before it and the average of the next bucket.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    n_out = max(n_out, 3)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        ax, ay = x[keep[i]], y[keep[i]]
+        area = np.abs((ax - next_x) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y - ay))
+        keep[i + 1] = start + area.argmax()
+    return keep
+
+
+def minmax_downsample(y, n_out):
+    """Indices of the minimum and maximum of each bucket, plus the first and last point.
+
+    Below 4 points there is no room for a min/max pair, so the first and last
+    point are kept plus, for n_out == 3, the interior extreme furthest from them.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 4:
+        keep = [0, n - 1][:max(n_out, 1)]
+        if n_out == 3:
+            interior = y[1:-1]
+            level = (y[0] + y[-1]) / 2
+            extremes = [interior.argmin(), interior.argmax()]
+            keep.append(1 + max(extremes, key=lambda i: abs(interior[i] - level)))
+        return np.unique(keep)
+    n_buckets = max((n_out - 2) // 2, 1)
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    keep = [0, n - 1]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            keep += [start + y[start:end].argmin(), start + y[start:end].argmax()]
+    return np.unique(keep)
+
+
+def top_establishments(cube, metric='MEMBER', top_n=50, by='last'):
+    """EST IDs of the `top_n` establishments ranked by the last, mean or max value of a metric."""
+    values = cube.values[..., cube.metric_index[metric]]
+    present = ~np.isnan(values)
+    if by == 'last':
+        last = values.shape[1] - 1 - present[:, ::-1].argmax(axis=1)
+        score = values[np.arange(len(values)), last]
+    elif by == 'mean':
+        score = np.nansum(values, axis=1) / np.maximum(present.sum(axis=1), 1)
+    elif by == 'max':
+        score = np.where(present, values, -np.inf).max(axis=1)
+    else:
+        raise ValueError("by must be 'last', 'mean' or 'max'")
+    score = np.where(present.any(axis=1), score, -np.inf)
+    order = np.argsort(-score, kind='stable')[:top_n]
+    return list(cube.est_ids[order])
+
+
+def plot_establishment_trends(data, metric='MEMBER', est_ids=None, top_n=50, by='last',
+                              max_points=20000, method='lttb', title=None):
+    """WebGL line chart of establishment trends that stays under `max_points` points.
+
+    `data` is an EstmstCube or a tidy/long estmst frame. Without `est_ids` the
+    `top_n` establishments by `metric` are plotted, at most max_points // 3 of
+    them since every series needs 3 points. Each series gets an equal share of
+    the point budget and is downsampled with LTTB or min/max.
+    """
+    cube = data if isinstance(data, EstmstCube) else EstmstAnalyzer().to_cube(data)
+    if method not in ('lttb', 'minmax'):
+        raise ValueError("method must be 'lttb' or 'minmax'")
+    max_series = max_points // 3
+    if est_ids is None:
+        est_ids = top_establishments(cube, metric, min(top_n, max_series), by)
+    elif len(est_ids) > max_series:
+        raise ValueError(f"{len(est_ids)} series need at least {3 * len(est_ids)} points, max_points is {max_points}")
+    per_series = max_points // max(len(est_ids), 1)
+    month_no = cube.months.year.to_numpy() * 12 + cube.months.month.to_numpy()
+
+    fig = go.Figure()
+    for est_id in est_ids:
+        y = cube.series(est_id, metric)
+        observed = np.flatnonzero(~np.isnan(y))
+        if method == 'lttb':
+            keep = observed[lttb_downsample(month_no[observed], y[observed], per_series)]
+        else:
+            keep = observed[minmax_downsample(y[observed], per_series)]
+        fig.add_trace(go.Scattergl(x=cube.months[keep], y=y[keep], mode='lines', name=str(est_id)))
+    fig.update_layout(title=title or f'{metric} by establishment', xaxis_title='date', yaxis_title=metric)
+    return fig
@@ -0,0 +1,122 @@
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from pathlib import Path
+import pandas as pd
+
+from .excel_export import ExcelStreamWriter, sheet_name
+from .html_table import HtmlTableWriter
+from .listing_engine import ListingEngine
+from .pdf_render_pool import PDFRenderPool
+
+DEFAULT_TEMPLATE = '<html><head><meta charset="utf-8"></head><body>%s</body></html>'
+
+
+def _file_key(key, used=()):
+    """File-name safe form of key, with a _2, _3, ... suffix when it clashes with one in used."""
+    base = 'blank' if pd.isna(key) else re.sub(r'[^\w.-]+', '_', str(key)).strip('_') or 'blank'
+    name = base
+    n = 1
+    # compared case-insensitively, as on Windows file systems
+    while name.lower() in used:
+        n += 1
+        name = f'{base}_{n}'
+    return name
+
+
+def _write_xlsx(path, df, sheet):
+    start = time.perf_counter()
+    try:
+        with ExcelStreamWriter(path) as writer:
+            writer.write(df, sheet)
+        return None, time.perf_counter() - start
+    except Exception as e:
+        return str(e), time.perf_counter() - start
+
+
+"""
+Example usecase:
+fanout = WorklistFanout('downloads/2023_04_05/worklists', template_path='downloads/template.html',
+                        render_pool=PDFRenderPool(wkhtmltopdf_path, max_workers=8))
+manifest = fanout.run(reporter.plan.listings['df_claim_pivot3'], by='TASK ID',
+                      title='Claims pending more than 20 days')
+manifest[~manifest['ok']]
+"""
+class WorklistFanout:
+    """Splits one listing into a PDF and/or XLSX worklist per TASK ID or GROUP ID.
+
+    The listing is sorted once (ListingEngine) and each key's rows are a
+    slice of it. PDFs go through a PDFRenderPool and workbooks through a
+    process pool at the same time, so hundreds of small worklists cost about
+    as much as a few large ones. A manifest.csv lists every output.
+    """
+
+    def __init__(self, output_dir, template_path=None, render_pool=None, max_workers=None,
+                 classes='table table-sm table-bordered border-primary d-print-table fs-6', options=None):
+        self.output_dir = output_dir
+        self.template = Path(template_path).read_text() if template_path else DEFAULT_TEMPLATE
+        self.render_pool = render_pool
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.classes = classes
+        self.options = options or {'page-size': 'A4', 'margin-top': '0.2in', 'margin-right': '0.2in',
+                                   'margin-bottom': '0.2in', 'margin-left': '0.2in'}
+
+    def render_html(self, df, title):
+        writer = HtmlTableWriter(classes=self.classes)
+        table = writer.to_html(df.reset_index(drop=True))
+        return self.template % (writer.stylesheet() + f"<h5>{escape(title)}</h5>" + table)
+
+    def run(self, listing, by='TASK ID', formats=('pdf', 'xlsx'), title='Worklist', prefix=None, columns=None):
+        """Write one worklist per value of `by` and return the manifest as a DataFrame."""
+        if 'pdf' in formats and self.render_pool is None:
+            self.render_pool = PDFRenderPool(max_workers=self.max_workers)
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = prefix or _file_key(title)
+        engine = listing if isinstance(listing, ListingEngine) else ListingEngine(listing)
+        frame = engine.sorted if columns is None else engine.sorted[list(columns)]
+        start = time.perf_counter()
+
+        entries = []
+        used = set()
+        for key, rows in engine.partitions(by).items():
+            file_key = _file_key(key, used)
+            used.add(file_key.lower())
+            base = os.path.join(self.output_dir, f"{prefix}_{file_key}")
+            entries.append({'key': key, 'rows': frame.iloc[rows], 'pdf': base + '.pdf' if 'pdf' in formats else None,
+                            'xlsx': base + '.xlsx' if 'xlsx' in formats else None})
+
+        with ProcessPoolExecutor(self.max_workers) as executor:
+            # workbooks are written in worker processes while wkhtmltopdf renders the PDFs
+            xlsx_futures = [executor.submit(_write_xlsx, e['xlsx'], e['rows'], sheet_name('blank' if pd.isna(e['key']) else e['key']))
+                            for e in entries if e['xlsx']]
+            pdf_jobs = [(self.render_html(e['rows'], f"{title} - {by} {e['key']}"), self.options, e['pdf'])
+                        for e in entries if e['pdf']]
+            pdf_results = iter(self.render_pool.render(pdf_jobs) if pdf_jobs else [])
+            xlsx_results = iter([future.result() for future in xlsx_futures])
+
+        manifest = []
+        for e in entries:
+            errors = []
+            seconds = 0.0
+            if e['pdf']:
+                result = next(pdf_results)
+                seconds += result['seconds']
+                if not result['ok']:
+                    errors.append(f"pdf: {result['error']}")
+            if e['xlsx']:
+                error, xlsx_seconds = next(xlsx_results)
+                seconds += xlsx_seconds
+                if error:
+                    errors.append(f"xlsx: {error}")
+            manifest.append({by: e['key'], 'rows': len(e['rows']), 'pdf': e['pdf'], 'xlsx': e['xlsx'],
+                             'ok': not errors, 'error': '; '.join(errors) or None, 'seconds': round(seconds, 3)})
+        manifest = pd.DataFrame(manifest, columns=[by, 'rows', 'pdf', 'xlsx', 'ok', 'error', 'seconds'])
+        if entries:
+            # integer keys with a missing one stay Int64 instead of turning into floats
+            manifest[by] = pd.array([e['key'] for e in entries])
+        manifest.to_csv(os.path.join(self.output_dir, 'manifest.csv'), index=False)
+        print(f"{len(manifest)} worklists by {by} ({int(manifest['ok'].sum())} ok) "
+              f"in {time.perf_counter() - start:.2f}s -> {self.output_dir}")
+        return manifest
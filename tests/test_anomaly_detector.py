@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.epftools.anomaly_detector import AnomalyDetector
+from src.epftools.estmst_analyzer import EstmstAnalyzer
+
+class TestAnomalyDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.detector = AnomalyDetector(window=6, threshold=3.5)
+        dates = pd.date_range('2022-01-01', periods=12, freq='MS')
+        steady = [100, 102, 98, 101, 99, 100, 103, 97, 100, 101, 99, 100]
+        dropped = [200, 198, 202, 201, 199, 200, 200, 40, 201, 199, 200, 202]
+        self.df = pd.DataFrame({
+            'EST ID': ['EST1'] * 12 + ['EST2'] * 12,
+            'date': list(dates) * 2,
+            'AMOUNT': steady + dropped,
+            'ECR': [1] * 24,
+            'MEMBER': [10] * 23 + [50],
+        })
+        self.cube = EstmstAnalyzer().to_cube(self.df)
+
+    def test_robust_zscores_window(self):
+        zscores = self.detector.robust_zscores(self.cube.values)
+        self.assertTrue(np.isnan(zscores[:, :6]).all())
+        self.assertFalse(np.isnan(zscores[:, 6:]).any())
+
+    def test_detect_flags_drop_and_spike(self):
+        flags = self.detector.detect(self.cube)
+        self.assertEqual(len(flags), 2)
+        drop = flags[flags['direction'] == 'drop'].iloc[0]
+        self.assertEqual((drop['EST ID'], drop['metric'], drop['value'], drop['median']), ('EST2', 'AMOUNT', 40, 200))
+        self.assertEqual(drop['date'], pd.Timestamp('2022-08-01'))
+        spike = flags[flags['direction'] == 'spike'].iloc[0]
+        self.assertEqual((spike['EST ID'], spike['metric']), ('EST2', 'MEMBER'))
+
+    def test_detect_ignores_unregistered_months(self):
+        self.cube.values[0, :4] = np.nan
+        flags = self.detector.detect(self.cube, metrics=['AMOUNT'])
+        self.assertEqual(list(flags['EST ID']), ['EST2'])
+
+    def test_chunked_scores_match(self):
+        self.cube.values[0, :4] = np.nan
+        chunked = AnomalyDetector(window=6, threshold=3.5, chunk_size=1)
+        np.testing.assert_array_equal(chunked.robust_zscores(self.cube.values),
+                                      self.detector.robust_zscores(self.cube.values))
+
+    def test_monthwise_claims(self):
+        claims = pd.DataFrame({
+            'CLAIM_ID': range(6),
+            'month': ['01', '01', '02', '02', '02', '03'],
+            'ym': ['202401', '202401', '202402', '202402', '202402', '202403'],
+            'FORM_NAME': ['19', '31', '19', '19', '31', '19'],
+            'GROUP_ID': [101, 101, 102, 101, 101, 102],
+        })
+        pivot = self.detector.monthwise_formwise_claims(claims)
+        self.assertEqual(pivot.loc['02', '19'], 2)
+        self.assertEqual(pivot.loc['All', 'All'], 6)
+        self.assertEqual(list(self.detector.monthwise_claims(claims)['claims']), [2, 3, 1])
+        anomalies = AnomalyDetector(window=2, threshold=1).claim_count_anomalies(claims, 'GROUP_ID')
+        self.assertEqual(list(anomalies.columns), ['GROUP_ID', 'ym', 'claims', 'zscore', 'direction'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import pandas as pd
+from src.epftools.claim_lifecycle import ClaimLifecycle, STAGES, stage_codes
+from src.epftools.daily_reporter import STATUS_BINS
+
+DA = 'Pending at DA Accounts'
+APPROVER = 'Pending at SS/AO/AC Accounts'
+CASH = 'Pending at Dispatch'
+
+class TestClaimLifecycle(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_claim_lifecycle"
+        self.days = {
+            '2023_06_12': {1: DA, 2: DA, 3: APPROVER},
+            '2023_06_13': {1: DA, 2: APPROVER, 4: DA},
+            '2023_06_15': {1: APPROVER, 4: DA, 5: 'Pending at Somewhere New'},
+            '2023_06_16': {1: CASH, 4: APPROVER},
+        }
+        for date, claims in self.days.items():
+            os.makedirs(os.path.join(self.test_dir, date), exist_ok=True)
+            self.write_day(date, claims)
+
+    def write_day(self, date, claims):
+        pd.DataFrame({'CLAIM ID': list(claims), 'TASK ID': [10101 + i for i in claims],
+                      'GROUP ID': 101, 'PENDING DAYS': 1, 'STATUS': list(claims.values()),
+                      }).to_csv(os.path.join(self.test_dir, date, "claim.csv"), index=False)
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def stints(self, lifecycle, claim_id):
+        events = lifecycle.events[lifecycle.events['CLAIM ID'] == claim_id]
+        return [(str(e.stage), str(e.entered.date()), None if pd.isna(e.exited) else str(e.exited.date()))
+                for e in events.sort_values('entered').itertuples()]
+
+    def test_stages_follow_report_bins(self):
+        statuses = pd.Series(['Pending at DA Pension [PPO Generation]', 'Pending at AC Pension [PPO Generation]',
+                              'Pending [ Referred to Other Office ]', 'Pending at DA', 'Unknown status'])
+        self.assertEqual([STAGES[code] for code in stage_codes(statuses)], ['Pension', 'Pension', 'Cash', 'DA', 'Other'])
+        self.assertNotIn('Other', [STAGES[code] for code in stage_codes(pd.Series(list(STATUS_BINS)))])
+
+    def test_event_log(self):
+        lifecycle = ClaimLifecycle()
+        self.assertEqual(lifecycle.update(self.test_dir), list(self.days))
+        self.assertEqual(self.stints(lifecycle, 1), [('DA', '2023-06-12', '2023-06-15'),
+                                                    ('Approver', '2023-06-15', '2023-06-16'),
+                                                    ('Cash', '2023-06-16', None)])
+        self.assertEqual(self.stints(lifecycle, 2), [('DA', '2023-06-12', '2023-06-13'),
+                                                    ('Approver', '2023-06-13', '2023-06-15')])
+        self.assertEqual(self.stints(lifecycle, 5), [('Other', '2023-06-15', '2023-06-16')])
+        with self.assertRaises(ValueError):
+            lifecycle.add_snapshot('2023_06_14', pd.DataFrame({'CLAIM ID': [1], 'STATUS': [DA]}))
+
+    def test_dwell_stats(self):
+        lifecycle = ClaimLifecycle()
+        lifecycle.update(self.test_dir)
+        dwell = lifecycle.dwell_times()
+        # stints already running on the first day and open stints are left out
+        self.assertEqual(sorted(dwell['days'].tolist()), [1, 1, 2, 3])
+        stats = lifecycle.dwell_stats(by=['GROUP ID'])
+        self.assertEqual(stats.loc[('Approver', 101), 'count'], 2)
+        self.assertEqual(stats.loc[('DA', 101), 'max'], 3)
+        self.assertEqual(len(lifecycle.dwell_times(complete_only=False)), len(lifecycle.events))
+
+    def test_incremental_save_and_load(self):
+        path = os.path.join(self.test_dir, "lifecycle.parquet")
+        last = os.path.join(self.test_dir, '2023_06_16')
+        os.rename(last, os.path.join(self.test_dir, 'later'))
+        lifecycle = ClaimLifecycle.load(path)
+        lifecycle.update(self.test_dir)
+        lifecycle.save(path)
+        os.rename(os.path.join(self.test_dir, 'later'), last)
+
+        resumed = ClaimLifecycle.load(path)
+        self.assertEqual(resumed.update(self.test_dir), ['2023_06_16'])
+        full = ClaimLifecycle()
+        full.update(self.test_dir)
+        key = ['CLAIM ID', 'entered']
+        pd.testing.assert_frame_equal(resumed.events.sort_values(key).reset_index(drop=True),
+                                      full.events.sort_values(key).reset_index(drop=True), check_dtype=False)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -103,5 +103,24 @@ class TestDailyReporter(unittest.TestCase):
         # Check if pdfkit.from_string was called (meaning PDF was attempted to be generated)
         mock_from_string.assert_called_once()
 
+        # One listing sheet per table, holding the rows that table counts
+        listing = [f for f in os.listdir(self.download_dir) if f.startswith('listing_')]
+        self.assertEqual(len(listing), 1)
+        sheets = pd.read_excel(os.path.join(self.download_dir, listing[0]), sheet_name=None)
+        self.assertEqual(len(sheets), len(self.reporter.plan.tables))
+        self.assertEqual(len(sheets['Claim Pendency (at each level >']), 1)
+
+    def test_export_worklists(self):
+        output_dir = os.path.join(self.download_dir, "worklists")
+        manifest = self.reporter.export_worklists(by='TASK ID', formats=('xlsx',), output_dir=output_dir)
+        self.assertEqual(manifest['TASK ID'].tolist(), [10201])
+        self.assertTrue(manifest['ok'].all())
+        self.assertTrue(os.path.exists(os.path.join(output_dir, 'manifest.csv')))
+
+    @patch('src.epftools.daily_reporter.WorklistFanout')
+    def test_export_worklists_uses_template(self, mock_fanout):
+        self.reporter.export_worklists(formats=('xlsx',), output_dir=os.path.join(self.download_dir, "worklists"))
+        self.assertEqual(mock_fanout.call_args.kwargs['template_path'], self.reporter.template_path)
+
 if __name__ == '__main__':
     unittest.main()
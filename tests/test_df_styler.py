@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.epftools.df_styler import DataFrameStyler
+
+class TestDataFrameStyler(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({'A': [10, 20, 5, 35], 'B': [30, 40, 0, 70], 'All': [40, 60, 5, 105]},
+                               index=['x', 'y', 'z', 'All'])
+
+    def test_series_helpers(self):
+        self.assertEqual(list(DataFrameStyler.highlight_max(self.df['A'], color='red')),
+                         ['', '', '', 'background-color: red'])
+        top3 = DataFrameStyler.highlight_top3(self.df['B'])
+        self.assertEqual([bool(v) for v in top3], [True, True, False, True])
+
+    def test_style_matrix_margins(self):
+        css = DataFrameStyler.style_matrix(self.df, [(('top', 1), 'T;'), (('gt', 15), 'G;')],
+                                           axis=0, default='b;', margins=True)
+        self.assertEqual(css.shape, self.df.shape)
+        np.testing.assert_array_equal(css[:3, :2], [['b;', 'b;G;'], ['b;T;G;', 'b;T;G;'], ['b;', 'b;']])
+        self.assertTrue((css[-1] == 'b;').all() and (css[:, -1] == 'b;').all())
+
+    def test_rules_by_row_and_table(self):
+        rows = DataFrameStyler.rule_mask(self.df.to_numpy()[:3, :2], ('max',), axis=1)
+        np.testing.assert_array_equal(rows, [[False, True], [False, True], [True, False]])
+        table = DataFrameStyler.rule_mask(self.df.to_numpy(), ('top', 2), axis=None)
+        self.assertEqual(table.sum(), 2)
+        with self.assertRaises(ValueError):
+            DataFrameStyler.rule_mask(self.df.to_numpy(), ('median',))
+
+    def test_styled_to_html(self):
+        html = DataFrameStyler.get_styled_default(self.df).to_html()
+        self.assertIn('background-color: orange', html)
+        self.assertEqual(DataFrameStyler.style_matrix(pd.DataFrame(), [(('top', 3), 'x')], margins=True).shape, (0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 import unittest
 import pandas as pd
 import os
-from src.epftools.estmst_analyzer import EstmstAnalyzer
+import numpy as np
+from src.epftools.estmst_analyzer import EstmstAnalyzer, EstmstCube
 
 class TestEstmstAnalyzer(unittest.TestCase):
 
@@ -57,9 +58,122 @@ class TestEstmstAnalyzer(unittest.TestCase):
         self.assertIn('MEMBER', df_analyzed.columns)
         self.assertEqual(len(df_analyzed), 6) # 2 EST IDs * 3 months across files
 
+    def test_parse_estmst_file_wide(self):
+        df = self.analyzer.parse_estmst_file(os.path.join(self.test_dir, "2016.csv"), wide=True)
+        self.assertEqual(list(df.columns), ['EST ID', 'date', 'AMOUNT', 'ECR', 'MEMBER'])
+        self.assertEqual(len(df), 4)
+        self.assertEqual(str(df['MEMBER'].dtype), 'int64')
+        row = df[(df['EST ID'] == 'EST2') & (df['date'] == '2016-02-01')].iloc[0]
+        self.assertEqual((row['AMOUNT'], row['ECR'], row['MEMBER']), (210, 21, 4))
+
+    def test_parse_estmst_file_with_metric_header_row(self):
+        filepath = os.path.join(self.test_dir, "downloaded.csv")
+        with open(filepath, "w") as f:
+            f.write("EST ID,Contribution Jan-2016,Contribution Jan-2016,Contribution Jan-2016,Total\n"
+                    "EST ID,AMOUNT,ECR,MEMBER,AMOUNT\n"
+                    "EST1,\"1,000\",2,3,99\n")
+        df = self.analyzer.parse_estmst_file(filepath, wide=True)
+        self.assertEqual(len(df), 1)
+        self.assertEqual((df['AMOUNT'][0], df['ECR'][0], df['MEMBER'][0]), (1000, 2, 3))
+
+    def test_analyze_multiple_estmst_files_overlap(self):
+        self.create_dummy_estmst_csv(os.path.join(self.test_dir, "12months.csv"), {
+            "EST ID": ["EST1", "EST2"],
+            "Jan-2017_AMOUNT": [125, 225],
+            "Jan-2017_ECR": [12, 22],
+            "Jan-2017_MEMBER": [7, 6],
+            "Feb-2017_AMOUNT": [130, 230],
+            "Feb-2017_ECR": [13, 23],
+            "Feb-2017_MEMBER": [8, 9],
+        })
+        filenames = {
+            "2016": os.path.join(self.test_dir, "2016.csv"),
+            "2017": os.path.join(self.test_dir, "2017.csv"),
+            "12months": os.path.join(self.test_dir, "12months.csv"),
+        }
+        df_parallel = self.analyzer.analyze_multiple_estmst_files(filenames, max_workers=2)
+        df_serial = self.analyzer.analyze_multiple_estmst_files(filenames, max_workers=1)
+        pd.testing.assert_frame_equal(df_parallel, df_serial)
+        self.assertEqual(len(df_parallel), 8)
+        self.assertEqual(list(df_parallel['EST ID'][:4]), ['EST1'] * 4)
+        self.assertTrue(df_parallel.groupby('EST ID')['date'].apply(lambda s: s.is_monotonic_increasing).all())
+        jan = df_parallel[(df_parallel['EST ID'] == 'EST1') & (df_parallel['date'] == '2017-01-01')].iloc[0]
+        self.assertEqual((jan['AMOUNT'], jan['MEMBER']), (125, 7))
+
+    def test_parse_estmst_file_projection(self):
+        filepath = os.path.join(self.test_dir, "2016.csv")
+        df = self.analyzer.parse_estmst_file(filepath, wide=True, start='2016-02', metrics=['member'])
+        self.assertEqual(list(df.columns), ['EST ID', 'date', 'MEMBER'])
+        self.assertEqual(list(df['MEMBER']), [3, 4])
+        df = self.analyzer.parse_estmst_file(filepath, last_months=1, metrics=['AMOUNT', 'ECR'])
+        self.assertEqual(len(df), 4)
+        self.assertTrue((df['date'] == '2016-02-01').all())
+        df = self.analyzer.parse_estmst_file(filepath, end='2016-01')
+        self.assertTrue((df['date'] == '2016-01-01').all())
+
     def test_change_col(self):
         self.assertEqual(self.analyzer._change_col("Jan-2023"), "2023-01")
         self.assertEqual(self.analyzer._change_col("Dec-2022"), "2022-12")
 
+
+class TestEstmstCube(unittest.TestCase):
+
+    def setUp(self):
+        dates = pd.date_range('2022-01-01', periods=14, freq='MS')
+        self.df = pd.DataFrame({
+            'EST ID': ['EST1'] * 14 + ['EST2'] * 3,
+            'date': list(dates) + list(dates[[0, 1, 3]]),
+            'AMOUNT': list(range(100, 114)) + [5, 0, 7],
+            'ECR': [1] * 14 + [1, 0, 1],
+            'MEMBER': list(range(10, 24)) + [2, 0, 4],
+        })
+        self.cube = EstmstAnalyzer().to_cube(self.df)
+
+    def test_shape_and_series(self):
+        self.assertEqual(self.cube.values.shape, (2, 14, 3))
+        np.testing.assert_array_equal(self.cube.series('EST2', 'MEMBER')[:5], [2, 0, np.nan, 4, np.nan])
+        self.assertEqual(self.cube.series('EST1', 'AMOUNT')[13], 113)
+
+    def test_deltas_and_rolling_mean(self):
+        yoy = self.cube.yoy('MEMBER')
+        self.assertTrue(np.isnan(yoy[0, :12]).all())
+        self.assertEqual(list(yoy[0, 12:]), [12, 12])
+        mom = self.cube.mom('AMOUNT', pct=True)
+        self.assertAlmostEqual(mom[0, 1], 1.0)
+        rolling = self.cube.rolling_mean(3, 'MEMBER')
+        self.assertEqual(rolling[0, 2], 11)
+        self.assertEqual(rolling[1, 3], 2)  # mean of 0 and 4, the missing month is skipped
+
+    def test_gaps(self):
+        gaps = self.cube.gaps('ECR')
+        self.assertFalse(gaps[0].any())
+        self.assertEqual(list(np.flatnonzero(gaps[1])), [1, 2])
+
+    def test_round_trip(self):
+        expected = self.df.sort_values(['EST ID', 'date']).reset_index(drop=True)
+        pd.testing.assert_frame_equal(self.cube.to_frame(), expected, check_dtype=False)
+
+    def test_empty_frame(self):
+        cube = EstmstCube.from_frame(self.df.iloc[:0])
+        self.assertEqual(cube.values.shape, (0, 0, 3))
+        self.assertEqual(len(cube.to_frame()), 0)
+        grown = cube.with_frame(self.df)
+        np.testing.assert_array_equal(grown.values, self.cube.values)
+
+    def test_with_frame_of_some_metrics(self):
+        update = pd.DataFrame({'EST ID': ['EST2', 'EST1'], 'date': pd.to_datetime(['2022-03-01', '2022-01-01']),
+                               'MEMBER': [3, 99]})
+        cube = self.cube.with_frame(update)
+        np.testing.assert_array_equal(cube.series('EST2')[2], [np.nan, np.nan, 3])
+        np.testing.assert_array_equal(cube.series('EST1')[0], [100, 1, 99])
+
+    def test_to_frame_with_missing_metric(self):
+        self.cube.values[1, 0, 1] = np.nan
+        df = self.cube.to_frame()
+        row = df[(df['EST ID'] == 'EST2') & (df['date'] == '2022-01-01')].iloc[0]
+        self.assertTrue(pd.isna(row['ECR']))
+        self.assertEqual(row['AMOUNT'], 5)
+        self.assertEqual(str(df['ECR'].dtype), 'Int64')
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from src.epftools.estmst_store import EstmstStore
+
+class TestEstmstStore(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_estmst_store"
+        self.store_dir = os.path.join(self.test_dir, "store")
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.create_dummy_estmst_csv(os.path.join(self.test_dir, "2023.csv"), {
+            "EST ID": ["EST1", "EST2"],
+            "Nov-2023_AMOUNT": [100, 200], "Nov-2023_ECR": [1, 2], "Nov-2023_MEMBER": [10, 20],
+            "Dec-2023_AMOUNT": [110, 210], "Dec-2023_ECR": [1, 2], "Dec-2023_MEMBER": [11, 21],
+        })
+        self.create_dummy_estmst_csv(os.path.join(self.test_dir, "12months.csv"), {
+            "EST ID": ["EST1", "EST3"],
+            "Dec-2023_AMOUNT": [999, 999], "Dec-2023_ECR": [9, 9], "Dec-2023_MEMBER": [99, 99],
+            "Jan-2024_AMOUNT": [120, 300], "Jan-2024_ECR": [1, 3], "Jan-2024_MEMBER": [12, 30],
+        })
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def create_dummy_estmst_csv(self, filepath, data):
+        pd.DataFrame(data).to_csv(filepath, index=False)
+
+    def test_append_writes_only_new_months(self):
+        store = EstmstStore(self.store_dir)
+        self.assertEqual(store.append_file(os.path.join(self.test_dir, "2023.csv")), ['2023-11', '2023-12'])
+        dec_partition = os.path.join(self.store_dir, "year=2023", "2023-12.parquet")
+        mtime = os.path.getmtime(dec_partition)
+
+        self.assertEqual(store.append_file(os.path.join(self.test_dir, "12months.csv")), ['2024-01'])
+        self.assertEqual(os.path.getmtime(dec_partition), mtime)
+        self.assertTrue(os.path.exists(os.path.join(self.store_dir, "year=2024", "2024-01.parquet")))
+
+        reopened = EstmstStore(self.store_dir)
+        self.assertEqual(reopened.months, ['2023-11', '2023-12', '2024-01'])
+        df = reopened.to_frame()
+        self.assertEqual(len(df), 6)
+        self.assertEqual(df[(df['EST ID'] == 'EST1') & (df['date'] == '2023-12-01')]['AMOUNT'].iloc[0], 110)
+        self.assertEqual(len(reopened.to_frame(start='2024-01')), 2)
+
+    def test_cube_updates_on_append(self):
+        store = EstmstStore(self.store_dir)
+        store.append_file(os.path.join(self.test_dir, "2023.csv"))
+        cube = store.to_cube()
+        self.assertEqual(cube.values.shape, (2, 2, 3))
+        store.append_file(os.path.join(self.test_dir, "12months.csv"))
+        cube = store.to_cube()
+        self.assertEqual(cube.values.shape, (3, 3, 3))
+        np.testing.assert_array_equal(cube.series('EST1', 'MEMBER'), [10, 11, 12])
+        np.testing.assert_array_equal(cube.series('EST3', 'MEMBER'), [np.nan, np.nan, 30])
+        rebuilt = EstmstStore(self.store_dir).to_cube()
+        np.testing.assert_array_equal(rebuilt.values, cube.values)
+
+    def test_overwrite(self):
+        store = EstmstStore(self.store_dir)
+        store.append_file(os.path.join(self.test_dir, "2023.csv"))
+        self.assertEqual(store.append_file(os.path.join(self.test_dir, "12months.csv"), overwrite=True),
+                         ['2023-12', '2024-01'])
+        df = store.to_frame(start='2023-12', end='2023-12')
+        self.assertEqual(list(df['EST ID']), ['EST1', 'EST3'])
+
+    def test_append_parses_only_new_columns(self):
+        store = EstmstStore(self.store_dir)
+        store.append_file(os.path.join(self.test_dir, "2023.csv"))
+        self.create_dummy_estmst_csv(os.path.join(self.test_dir, "wide.csv"), {
+            "EST ID": ["EST1"],
+            "Oct-2023_AMOUNT": [1], "Oct-2023_ECR": [1], "Oct-2023_MEMBER": [1],
+            "Nov-2023_AMOUNT": [2], "Nov-2023_ECR": [2], "Nov-2023_MEMBER": [2],
+            "Dec-2023_AMOUNT": [3], "Dec-2023_ECR": [3], "Dec-2023_MEMBER": [3],
+            "Jan-2024_AMOUNT": [4], "Jan-2024_ECR": [4], "Jan-2024_MEMBER": [4],
+        })
+        with patch('src.epftools.estmst_analyzer.pd.read_csv', side_effect=pd.read_csv) as reader:
+            self.assertEqual(store.append_file(os.path.join(self.test_dir, "wide.csv")), ['2023-10', '2024-01'])
+        usecols = reader.call_args_list[-1].kwargs['usecols']
+        self.assertEqual(sorted({column[:8] for column in usecols[1:]}), ['Jan-2024', 'Oct-2023'])
+
+    def test_overwrite_updates_cube(self):
+        store = EstmstStore(self.store_dir)
+        store.append_file(os.path.join(self.test_dir, "2023.csv"))
+        store.to_cube()
+        store.append_file(os.path.join(self.test_dir, "12months.csv"), overwrite=True)
+        cube = store.to_cube()
+        # EST2 is not in the rewritten December
+        np.testing.assert_array_equal(cube.series('EST2', 'MEMBER'), [20, np.nan, np.nan])
+        np.testing.assert_array_equal(cube.series('EST1', 'MEMBER'), [10, 99, 12])
+        rebuilt = EstmstStore(self.store_dir).to_cube()
+        np.testing.assert_array_equal(rebuilt.values, cube.values)
+
+    def test_empty_store_cube(self):
+        store = EstmstStore(self.store_dir)
+        cube = store.to_cube()
+        self.assertEqual(cube.values.shape[:2], (0, 0))
+        store.append_file(os.path.join(self.test_dir, "2023.csv"))
+        self.assertEqual(store.to_cube().values.shape, (2, 2, 3))
+
+if __name__ == '__main__':
+    unittest.main()
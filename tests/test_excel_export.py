@@ -0,0 +1,58 @@
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from src.epftools.excel_export import ExcelStreamWriter, write_sheets, sheet_name
+
+class TestExcelExport(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_excel_export"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.path = os.path.join(self.test_dir, "out.xlsx")
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_sheet_name(self):
+        self.assertEqual(sheet_name('Claims [>20]/DA'), 'Claims  >20  DA')
+        self.assertEqual(len(sheet_name('x' * 40)), 31)
+        self.assertEqual(sheet_name('Claims', used={'claims'}), 'Claims (2)')
+
+    def test_round_trip_in_blocks(self):
+        df = pd.DataFrame({
+            'TASK ID': np.arange(25),
+            'PENDING DAYS': [1.5, np.nan] + [2.0] * 23,
+            'STATUS': pd.Series(['DA', None] + ['Approver'] * 23, dtype='str'),
+            'cat': pd.Categorical(['<=10 Days'] * 25),
+            'DATE': pd.to_datetime(['2024-01-02', None] + ['2024-03-04'] * 23),
+            'FLAG': [True, False] * 12 + [True],
+        })
+        write_sheets(self.path, {'Listing': df, 'Empty': df.iloc[:0]}, block_rows=7)
+        back = pd.read_excel(self.path, sheet_name=None)
+        self.assertEqual(list(back), ['Listing', 'Empty'])
+        listing = back['Listing']
+        self.assertEqual(len(listing), 25)
+        self.assertEqual(listing['TASK ID'].tolist(), list(range(25)))
+        self.assertTrue(pd.isna(listing['PENDING DAYS'][1]))
+        self.assertTrue(pd.isna(listing['STATUS'][1]))
+        self.assertEqual(listing['cat'][0], '<=10 Days')
+        self.assertEqual(listing['DATE'][0], pd.Timestamp('2024-01-02'))
+        self.assertTrue(pd.isna(listing['DATE'][1]))
+        self.assertEqual(list(back['Empty'].columns), list(df.columns))
+        sheet = load_workbook(self.path)['Listing']
+        self.assertEqual(sheet['E2'].number_format, 'dd-mm-yyyy')
+
+    def test_append_to_sheet(self):
+        with ExcelStreamWriter(self.path) as writer:
+            writer.write(pd.DataFrame({0: ['a', 'b']}), header=False)
+            rows = writer.write(pd.DataFrame({0: ['c']}), header=False)
+        self.assertEqual(rows, 3)
+        back = pd.read_excel(self.path, header=None)
+        self.assertEqual(back[0].tolist(), ['a', 'b', 'c'])
+
+if __name__ == '__main__':
+    unittest.main()
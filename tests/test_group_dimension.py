@@ -0,0 +1,62 @@
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from src.epftools.group_dimension import GroupDimension, GROUP_OFFICERS
+
+class TestGroupDimension(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_group_dimension"
+        os.makedirs(self.test_dir, exist_ok=True)
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_default_matches_officer_lists(self):
+        groups = pd.Series([110, 111, 112, 113, 106, 107, 109, 114, 104, 105, 108, 188, 101, 102, 103])
+        officers = GroupDimension.default().lookup(groups)
+        self.assertEqual(officers.tolist(), ['GM'] * 4 + ['NK'] * 4 + ['VK'] * 4 + ['SR'] * 3)
+        expected = groups.map({g: o for o, gs in GROUP_OFFICERS.items() for g in gs})
+        self.assertEqual(officers.astype(object).tolist(), expected.tolist())
+
+    def test_unknown_and_missing_groups(self):
+        groups = pd.Series([101, 100, 999, None, 50, 188], dtype='Int64', index=list('abcdef'))
+        officers = GroupDimension.default().lookup(groups)
+        self.assertEqual(list(officers.index), list('abcdef'))
+        self.assertEqual(officers.isna().tolist(), [False, True, True, True, True, False])
+        self.assertEqual(officers['f'], 'VK')
+
+    def test_attach_from_csv(self):
+        path = os.path.join(self.test_dir, "groups.csv")
+        pd.DataFrame({'GROUP ID': [101, 102, 110], 'Officer': ['SR', 'SR', 'GM'],
+                      'Section': ['Acc-I', 'Acc-I', 'Acc-III'], 'Zone': ['North', 'North', 'South']}).to_csv(path, index=False)
+        groups = GroupDimension.from_file(path)
+        df = groups.attach(pd.DataFrame({'CLAIM ID': [1, 2, 3], 'GROUP ID': [110, 102, 105]}))
+        self.assertEqual(list(df.columns), ['CLAIM ID', 'GROUP ID', 'Officer', 'Section', 'Zone'])
+        self.assertEqual(df['Zone'].tolist()[:2], ['South', 'North'])
+        self.assertTrue(pd.isna(df['Section'][2]))
+        self.assertIsInstance(df['Officer'].dtype, pd.CategoricalDtype)
+        self.assertNotEqual(repr(groups), repr(GroupDimension.default()))
+
+    def test_from_yaml(self):
+        path = os.path.join(self.test_dir, "groups.yaml")
+        with open(path, "w") as f:
+            f.write("groups:\n"
+                    "  - {GROUP ID: 101, Officer: SR}\n"
+                    "  - {GROUP ID: 104, Officer: VK}\n")
+        groups = GroupDimension.from_file(path)
+        self.assertEqual(groups.lookup(np.array([104, 101]), 'Officer').tolist(), ['VK', 'SR'])
+
+    def test_invalid_table(self):
+        with self.assertRaises(ValueError):
+            GroupDimension(pd.DataFrame({'GROUP ID': [101, 101], 'Officer': ['SR', 'GM']}))
+        with self.assertRaises(ValueError):
+            GroupDimension(pd.DataFrame({'Officer': ['SR']}))
+        with self.assertRaises(KeyError):
+            GroupDimension.default().lookup(pd.Series([101]), 'Zone')
+
+if __name__ == '__main__':
+    unittest.main()
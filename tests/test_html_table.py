@@ -0,0 +1,50 @@
+import unittest
+import io
+import re
+import numpy as np
+import pandas as pd
+from src.epftools.html_table import HtmlTableWriter
+
+class TestHtmlTableWriter(unittest.TestCase):
+
+    def setUp(self):
+        df = pd.DataFrame({'GROUP ID': [101, 101, 102, 110], 'TASK ID': [10101, 10102, 10201, 11001],
+                           'Officer': ['SR', 'SR', 'SR', 'GM'], 'CLAIM ID': range(4)})
+        self.pivot = pd.pivot_table(df, values='CLAIM ID', index=['GROUP ID', 'TASK ID'],
+                                    columns=['Officer', 'GROUP ID'], aggfunc='count', margins=True).fillna(0).astype(int)
+        self.writer = HtmlTableWriter(classes='table table-sm')
+
+    def test_pivot_layout(self):
+        html = self.writer.to_html(self.pivot)
+        self.assertIn('<table class="table table-sm epf-table">', html)
+        self.assertIn('<th colspan="2">SR</th>', html)
+        self.assertIn('<th rowspan="2">101</th>', html)
+        self.assertEqual(html.count('<tr>'), 3 + len(self.pivot))
+        self.assertEqual(html.count('<td'), self.pivot.size)
+        self.assertNotIn('style=', html)
+
+    def test_cell_classes(self):
+        css = np.where(self.pivot.to_numpy() > 0, 'background-color: orange;', '')
+        html = self.writer.to_html(self.pivot, css)
+        self.assertEqual(html.count('class="epf-table-c0"'), int((self.pivot.to_numpy() > 0).sum()))
+        self.assertIn('.epf-table-c0 {background-color: orange;}', self.writer.stylesheet())
+        self.assertIn('table.epf-table td {font-size:10px;padding:2px;text-align:center;}', self.writer.stylesheet())
+
+    def test_stream_and_format(self):
+        df = pd.DataFrame({'name': ['<b>', 'x'], 'amount': [1.5, np.nan]})
+        out = io.StringIO()
+        HtmlTableWriter(precision=2, chunk_rows=1).write(df, out)
+        html = out.getvalue()
+        self.assertIn('<td>&lt;b&gt;</td><td>1.5</td>', html)
+        self.assertIn('<td>x</td><td></td>', html)
+
+    def test_cells_match_pandas(self):
+        df = pd.DataFrame({'name': ['<b>', 'x', 'y'], 'count': [1, 2, 3],
+                           'days': [12.0, 3.0, np.nan], 'ratio': [0.125, 1.5, 2.0]})
+        def cells(html):
+            return [cell.strip() for cell in re.findall(r'<td[^>]*>(.*?)</td>', html, re.S)]
+        self.assertEqual(cells(HtmlTableWriter().to_html(df)), cells(df.to_html(na_rep='')))
+        self.assertIn('<td>12.0</td>', HtmlTableWriter().to_html(df))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.epftools.listing_engine import ListingEngine, sort_order
+
+class TestListingEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'CLAIM ID': range(8),
+            'TASK ID': [10102, 10101, 10102, 10101, 10201, 10101, 10201, 10102],
+            'PENDING DAYS': [5, 30, 25, 2, 40, 30, 1, 12],
+            'STATUS': ['DA(Includes NTE)', 'Approver', 'DA(Includes NTE)', 'DA(Includes NTE)',
+                       'Dispatch', 'DA(Includes NTE)', 'Approver', 'Approver'],
+        })
+        self.engine = ListingEngine(self.df)
+
+    def test_sorted_once(self):
+        expected = self.df.sort_values(['TASK ID', 'PENDING DAYS'], ascending=[True, False], kind='stable')
+        pd.testing.assert_frame_equal(self.engine.sorted, expected)
+        self.assertEqual(sort_order(self.df, ['TASK ID'], False).tolist()[:2], [4, 6])
+
+    def test_listings_keep_worklist_order(self):
+        listing = self.engine.listing(status=['DA(Includes NTE)'], min_days=3)
+        self.assertEqual(listing['CLAIM ID'].tolist(), [5, 2, 0])
+        self.assertEqual(self.engine.listing(min_days=10, max_days=30)['CLAIM ID'].tolist(), [1, 5, 2, 7])
+        self.assertEqual(len(self.engine.listing()), 8)
+        # the shared condition is evaluated once
+        self.engine.listing(status=['DA(Includes NTE)'])
+        self.assertEqual(len(self.engine.conditions), 4)
+
+    def test_partitions(self):
+        parts = self.engine.partitions()
+        self.assertEqual(list(parts), [10101, 10102, 10201])
+        self.assertEqual(parts[10102], slice(3, 6))
+        self.assertEqual(self.engine.sorted.iloc[parts[10201]]['CLAIM ID'].tolist(), [4, 6])
+        by_status = self.engine.partitions('STATUS', self.engine.select(min_days=3))
+        self.assertEqual(self.engine.sorted.iloc[by_status['Approver']]['CLAIM ID'].tolist(), [1, 7])
+        within = self.engine.partitions(rows=self.engine.select(status=['Approver']))
+        np.testing.assert_array_equal(within[10101], [0])
+
+    def test_partitions_keep_missing_keys(self):
+        df = self.df.assign(**{'GROUP ID': pd.array([101, pd.NA, 102, 101, pd.NA, 102, 101, 101], dtype='Int64')})
+        engine = ListingEngine(df)
+        parts = engine.partitions('GROUP ID')
+        self.assertEqual(sum(len(rows) for rows in parts.values()), 8)
+        self.assertEqual(sorted(key for key in parts if not pd.isna(key)), [101, 102])
+        self.assertTrue(all(type(key) is int for key in parts if not pd.isna(key)))
+        missing = [rows for key, rows in parts.items() if pd.isna(key)][0]
+        self.assertEqual(sorted(engine.sorted.iloc[missing]['CLAIM ID']), [1, 4])
+        by_task = ListingEngine(df.assign(**{'TASK ID': df['GROUP ID'].astype('float64')})).partitions()
+        self.assertEqual(list(by_task)[:2], [101, 102])
+        self.assertTrue(pd.isna(list(by_task)[2]))
+
+    def test_mixed_task_ids(self):
+        df = pd.DataFrame({'TASK ID': ['10600-sum', 10101, np.nan], 'PENDING DAYS': [1, 2, 3]})
+        self.assertEqual(ListingEngine(df).sorted['PENDING DAYS'].tolist(), [2, 1, 3])
+
+if __name__ == '__main__':
+    unittest.main()
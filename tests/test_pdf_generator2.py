@@ -0,0 +1,51 @@
+import unittest
+import os
+import threading
+from unittest.mock import patch
+import pandas as pd
+from src.epftools.pdf_generator2 import PDFGenerator2, pdfkit_configuration
+
+class TestPDFGenerator2(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_pdf_generator2"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.template = os.path.join(self.test_dir, "template.html")
+        with open(self.template, "w") as f:
+            f.write("<html><body>%s</body></html>")
+        pdfkit_configuration.cache_clear()
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def fake_from_string(self, html, output_path, options=None, configuration=None):
+        with open(output_path, "w") as f:
+            f.write(html)
+
+    @patch('pdfkit.configuration')
+    def test_in_memory_parallel(self, mock_configuration):
+        outputs = [os.path.join(self.test_dir, f"out{i}.pdf") for i in range(4)]
+        generators = [PDFGenerator2(self.template, path, "/opt/wkhtmltopdf") for path in outputs]
+        with patch('pdfkit.from_string', side_effect=self.fake_from_string):
+            threads = [threading.Thread(target=g.generate_pdf, args=([pd.DataFrame({'report': [i]})],))
+                       for i, g in enumerate(generators)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        for i, path in enumerate(outputs):
+            with open(path) as f:
+                self.assertIn(f"<td>{i}</td>", f.read())
+        self.assertFalse(os.path.exists("tmp.html"))
+        mock_configuration.assert_called_once_with(wkhtmltopdf="/opt/wkhtmltopdf")
+
+    def test_prerendered_fragments(self):
+        generator = PDFGenerator2(self.template, os.path.join(self.test_dir, "out.pdf"))
+        html = generator.build_html(["<table><tr><th>a</th><td>1</td></tr></table>"], html=False)
+        self.assertIn('text-align:left', html)
+        self.assertIn('table-bordered', html)
+
+if __name__ == '__main__':
+    unittest.main()
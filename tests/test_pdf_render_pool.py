@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+from src.epftools.pdf_render_pool import PDFRenderPool, wkhtmltopdf_args
+
+STUB_RENDERER = """
+import sys, time
+html = sys.stdin.read()
+if 'FAIL' in html:
+    sys.stderr.write('stub render error')
+    sys.exit(2)
+if 'SLOW' in html:
+    time.sleep(5)
+with open(sys.argv[-1], 'w') as f:
+    f.write('%PDF-stub ' + ' '.join(sys.argv[1:-2]) + ' ' + html)
+"""
+
+class TestPDFRenderPool(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_pdf_render_pool"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.stub = os.path.join(self.test_dir, "stub_renderer.py")
+        with open(self.stub, "w") as f:
+            f.write(STUB_RENDERER)
+        self.pool = PDFRenderPool([sys.executable, self.stub], max_workers=3, timeout=2)
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_options_to_args(self):
+        self.assertEqual(wkhtmltopdf_args({'page-size': 'A4', 'quiet': None, 'dpi': 300}),
+                         ['--page-size', 'A4', '--quiet', '--dpi', '300'])
+
+    def test_render_batch_with_failures(self):
+        out = lambda name: os.path.join(self.test_dir, "out", name)
+        results = self.pool.render([
+            ("<p>one</p>", {'page-size': 'A4'}, out("one.pdf")),
+            ("<p>FAIL</p>", None, out("bad.pdf")),
+            ("<p>SLOW</p>", None, out("slow.pdf")),
+            ("<p>two</p>", {'orientation': 'Landscape'}, out("two.pdf")),
+        ])
+        self.assertEqual([r['ok'] for r in results], [True, False, False, True])
+        self.assertEqual(results[1]['returncode'], 2)
+        self.assertIn('stub render error', results[1]['error'])
+        self.assertIn('timed out', results[2]['error'])
+        self.assertTrue(all(r['seconds'] >= 0 for r in results))
+        with open(out("one.pdf")) as f:
+            self.assertEqual(f.read(), '%PDF-stub --quiet --page-size A4 <p>one</p>')
+
+    def test_missing_binary(self):
+        result = PDFRenderPool(os.path.join(self.test_dir, "missing-wkhtmltopdf")).render_one(
+            "<p>x</p>", None, os.path.join(self.test_dir, "x.pdf"))
+        self.assertFalse(result['ok'])
+        self.assertIsNotNone(result['error'])
+
+if __name__ == '__main__':
+    unittest.main()
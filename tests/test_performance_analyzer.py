@@ -5,7 +5,8 @@ from unittest.mock import patch, MagicMock
 import numpy as np
 import pandas as pd
 
-from src.epftools.performance_analyzer import PerformanceAnalyzer
+from src.epftools.performance_analyzer import (PerformanceAnalyzer, SnapshotComparer, sorted_membership,
+                                               parse_performance_report)
 
 class TestPerformanceAnalyzer(unittest.TestCase):
 
@@ -97,6 +98,23 @@ class TestPerformanceAnalyzer(unittest.TestCase):
         self.assertIn('TASK', df_compared.columns)
         self.assertIn('claim_2023_06_13', df_compared.columns)
 
+    def test_snapshot_sets(self):
+        comparer = SnapshotComparer(self.reports_dir, statuses=None)
+        self.assertEqual(comparer.dates(), ["2023_06_13", "2023_06_14"])
+        diff = comparer.compare("2023_06_13", "2023_06_14")
+        self.assertEqual(diff['cleared']['CLAIM ID'].tolist(), [3, 4])
+        self.assertEqual(diff['new']['CLAIM ID'].tolist(), [5, 6])
+        self.assertEqual(diff['carried']['CLAIM ID'].tolist(), [1, 2])
+        tin = comparer.compare("2023_06_13", "2023_06_14", "tin.csv")
+        self.assertEqual(tin['cleared']['GROUP ID'].tolist(), [202, 203])
+        pairs = [(a, b, len(d['cleared'])) for a, b, d in comparer.rolling(fname="tin.csv")]
+        self.assertEqual(pairs, [("2023_06_13", "2023_06_14", 2)])
+
+    def test_sorted_membership(self):
+        found = sorted_membership(np.array([0, 3, 5, 9, 12]), np.array([3, 4, 5, 12]))
+        self.assertEqual(found.tolist(), [False, True, True, False, True])
+        self.assertFalse(sorted_membership(np.array([1]), np.array([], dtype=np.int64)).any())
+
     def test_summarize_performance_excel(self):
         df_summary = self.analyzer.summarize_performance_excel(self.performance_da_excel, flag=1, mapping_file=self.mapping_excel)
         self.assertIsInstance(df_summary, pd.DataFrame)
@@ -104,5 +122,37 @@ class TestPerformanceAnalyzer(unittest.TestCase):
         self.assertIn('userid', df_summary.columns)
         self.assertIn('total', df_summary.columns)
 
+    def test_parse_performance_report(self):
+        def row(userid=None, label='', count=None, name=None):
+            values = dict.fromkeys(range(40))
+            values.update({1: userid, 3: name, 7: label})
+            for column in [9, 10, 12, 14, 17, 18, 20, 23, 26, 28, 31, 35]:
+                values[column] = count
+            return values
+        raw = pd.DataFrame([
+            row(label='TOTAL-:', count='9'),              # before any user
+            row(userid=1001, name='Asha', count='4'),
+            row(label='TOTAL-:', count='3'),
+            row(label='F19', count='F19'),                 # repeated header, not numeric
+            row(label='TOTAL-:', count='7'),               # last subtotal wins
+            row(userid=1002, name='Ravi', count='5'),
+            row(label='detail', count='2'),
+            row(userid='UNP SVR', name='Unassigned', count='1'),
+        ])
+        summary = parse_performance_report(raw)
+        self.assertEqual(summary['userid'].tolist(), [1001, 1002])
+        self.assertEqual(summary['Name'].tolist(), ['Asha', 'Ravi'])
+        self.assertEqual(summary['total'].tolist(), [7, 5])
+        self.assertEqual(summary['F19'].dtype.kind, 'i')
+
+    @patch('pdfkit.from_string')
+    def test_generate_performance_summary(self, mock_from_string):
+        path = self.analyzer.generate_performance_summary(self.performance_da_excel, self.performance_ao_excel,
+                                                          self.mapping_excel)
+        html = mock_from_string.call_args[0][0]
+        self.assertIn('DA performance', html)
+        self.assertIn('Approver Performance', html)
+        self.assertTrue(path.endswith('Performance_summary.pdf'))
+
 if __name__ == '__main__':
     unittest.main()
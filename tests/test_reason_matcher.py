@@ -0,0 +1,44 @@
+import unittest
+import os
+from src.epftools.reason_matcher import ReasonMatcher
+
+class TestReasonMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = ReasonMatcher().fit(
+            ['15G NOT SUBMITTED', 'PLEASE FILL ASSESSMENT YEAR IN 15G', 'CHEQUE NOT CLEAR', 'ALREADY SETTLED', None],
+            ['PAN n 15G', 'PAN n 15G', 'cheque-passbook', 'Already Settled', 'Ask'],
+        )
+
+    def test_top_k_handles_misspellings(self):
+        indices, scores = self.matcher.top_k(['15G NOT SUBMITED', 'FILL ASSESMENT YEAR', 'cheque not cleer'], k=2)
+        self.assertEqual(indices.shape, (3, 2))
+        self.assertEqual(list(indices[:, 0]), [0, 1, 2])
+        self.assertTrue((scores[:, 0] >= scores[:, 1]).all())
+        self.assertTrue(((scores > 0) & (scores <= 1)).any())
+
+    def test_match_returns_long_candidates(self):
+        candidates = self.matcher.match(['ALREADY SETLED', 'ALREADY SETLED'], k=3)
+        self.assertEqual(list(candidates.columns), ['query_no', 'rank', 'reason', 'category', 'score'])
+        self.assertEqual(len(candidates), 6)
+        self.assertEqual(list(candidates[candidates['rank'] == 1]['category']), ['Already Settled'] * 2)
+
+    def test_categorize_min_score(self):
+        result = self.matcher.categorize(['CHEQUE NOT CLEAR', 'XYZ', None], min_score=0.5)
+        self.assertEqual(result['predicted_category'][0], 'cheque-passbook')
+        self.assertTrue(result['predicted_category'][1:].isna().all())
+        self.assertAlmostEqual(result['similarity'][0], 1.0)
+
+    def test_refit_replaces_vocabulary(self):
+        self.matcher.fit(['ALREADY SETTLED'], ['Already Settled'])
+        self.assertEqual(set(self.matcher.vocabulary), self.matcher._ngrams('ALREADY SETTLED'))
+        self.assertEqual(len(self.matcher.indptr), len(self.matcher.vocabulary) + 1)
+        self.assertEqual(self.matcher.categorize(['ALREADY SETLED'])['predicted_category'][0], 'Already Settled')
+
+    def test_from_csv(self):
+        path = os.path.join(os.path.dirname(__file__), 'todo', 'reason_category.csv')
+        matcher = ReasonMatcher.from_csv(path)
+        self.assertEqual(matcher.categorize(['15G PANCARD NOT SUBMITED'])['predicted_category'][0], 'PAN n 15G')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import os
+import pandas as pd
+from src.epftools.rejection_categorizer import RejectionCategorizer, split_reject_reasons
+
+class TestRejectionCategorizer(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_rejection_data"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.training_data = pd.DataFrame({
+            'reason': ['15G NOT SUBMITTED', 'PAN NOT SEEDED 15G REQUIRED', 'FORM 15G INCORRECT',
+                       'CHEQUE NOT CLEAR', 'PASSBOOK NOT LEGIBLE', 'CANCELLED CHEQUE NOT UPLOADED',
+                       'ALREADY SETTLED', 'CLAIM ALREADY SETTLED EARLIER', None],
+            'category': ['PAN n 15G', 'PAN n 15G', 'PAN n 15G',
+                         'cheque-passbook', 'cheque-passbook', 'cheque-passbook',
+                         'Already Settled', 'Already Settled', 'Already Settled'],
+        })
+        self.categorizer = RejectionCategorizer(epochs=20)
+        self.categorizer.train(self.training_data, reason_column='reason', category_column='category',
+                               classes=['PDF Corrupted'])
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_predict(self):
+        predictions = self.categorizer.predict(['15G NOT SUBMITED', 'CHEQUE NOT CLEAR PLEASE UPLOAD'])
+        self.assertEqual(list(predictions), ['PAN n 15G', 'cheque-passbook'])
+
+    def test_update_only_uses_new_rows(self):
+        version = self.categorizer.version
+        seen = self.categorizer.n_samples_seen
+        new_rows = pd.DataFrame({'reason': ['PDF CORRUPTED', 'UPLOADED PDF IS CORRUPTED'],
+                                 'category': ['PDF Corrupted', 'PDF Corrupted']})
+        self.categorizer.update(new_rows, epochs=20)
+        self.assertEqual(self.categorizer.version, version + 1)
+        self.assertEqual(self.categorizer.n_samples_seen, seen + 2)
+        self.assertEqual(self.categorizer.predict(['PDF CORRUPTED'])[0], 'PDF Corrupted')
+
+    def test_update_rejects_unknown_category(self):
+        with self.assertRaises(ValueError):
+            self.categorizer.update(pd.DataFrame({'reason': ['X'], 'category': ['New']}))
+
+    def test_categorize_records_model_version(self):
+        df = pd.DataFrame({'CLAIM_ID': [1, 2], 'reason1': ['ALREADY SETTLED', None]})
+        result = self.categorizer.categorize(df)
+        self.assertIn('predicted_category', result.columns)
+        self.assertTrue((result['model_version'] == self.categorizer.version).all())
+        self.assertTrue(result['confidence'].between(0, 1).all())
+
+    def test_save_and_load_model(self):
+        path = os.path.join(self.test_dir, 'model.pkl')
+        self.categorizer.save_model(path)
+        loaded = RejectionCategorizer.load_model(path)
+        self.assertEqual(loaded.version, self.categorizer.version)
+        self.assertEqual(list(loaded.predict(['15G NOT SUBMITTED'])), ['PAN n 15G'])
+
+    def test_categorize_categorical_reasons(self):
+        df = pd.DataFrame({'reason_text': pd.Categorical(['ALREADY SETTLED', None, 'ALREADY SETTLED'])})
+        result = self.categorizer.categorize(df, reason_column='reason_text')
+        self.assertEqual(list(result['predicted_category'][[0, 2]]), ['Already Settled'] * 2)
+        self.assertFalse(result['confidence'].isna().any())
+
+
+class TestSplitRejectReasons(unittest.TestCase):
+
+    def test_split_keeps_every_reason(self):
+        df = pd.DataFrame({
+            'CLAIM_ID': [10, 11, 12, 13],
+            'REJECT_REASON': ['1) PAN NOT SEEDED 2) CHEQUE NOT CLEAR, 3) 15G FOR FY 2023-24) MISSING',
+                              None, 'ALREADY SETTLED', '1) A 2) 3) B'],
+        }, index=[5, 6, 7, 8])
+        reasons = split_reject_reasons(df)
+        self.assertEqual(list(reasons.columns), ['CLAIM_ID', 'reason_no', 'reason_text'])
+        self.assertEqual(list(reasons['CLAIM_ID']), [10, 10, 10, 12, 13, 13])
+        self.assertEqual(list(reasons['reason_no']), [1, 2, 3, 1, 1, 3])
+        self.assertEqual(list(reasons['reason_text']),
+                         ['PAN NOT SEEDED', 'CHEQUE NOT CLEAR', '15G FOR FY 2023-24) MISSING',
+                          'ALREADY SETTLED', 'A', 'B'])
+        self.assertIsInstance(reasons['reason_text'].dtype, pd.CategoricalDtype)
+
+    def test_split_uses_written_numbers(self):
+        df = pd.DataFrame({'CLAIM_ID': [10], 'REJECT_REASON': ['2) PAN NOT SEEDED 3) CHEQUE NOT CLEAR']})
+        reasons = split_reject_reasons(df)
+        self.assertEqual(list(reasons['reason_no']), [2, 3])
+        self.assertEqual(list(reasons['reason_text']), ['PAN NOT SEEDED', 'CHEQUE NOT CLEAR'])
+
+    def test_split_ignores_numbers_inside_reasons(self):
+        df = pd.DataFrame({'CLAIM_ID': [10, 11, 12], 'REJECT_REASON': [
+            '1) AGE (58) NOT MET 2) PAN NOT SEEDED',
+            '1) BANK (SEE ANNEX 2) ) 2) PAN NOT SEEDED',
+            'BANK (SEE ANNEX 2) )']})
+        reasons = split_reject_reasons(df)
+        self.assertEqual(list(zip(reasons['CLAIM_ID'], reasons['reason_no'], reasons['reason_text'])),
+                         [(10, 1, 'AGE (58) NOT MET'), (10, 2, 'PAN NOT SEEDED'),
+                          (11, 1, 'BANK (SEE ANNEX 2) )'), (11, 2, 'PAN NOT SEEDED'),
+                          (12, 1, 'BANK (SEE ANNEX 2) )')])
+
+    def test_split_without_numbered_reasons(self):
+        for reasons in ([], [None, None], ['ALREADY SETTLED']):
+            df = pd.DataFrame({'CLAIM_ID': list(range(len(reasons))), 'REJECT_REASON': pd.Series(reasons, dtype=object)})
+            result = split_reject_reasons(df)
+            self.assertEqual(list(result.columns), ['CLAIM_ID', 'reason_no', 'reason_text'])
+            self.assertEqual(list(result['reason_text']), [r for r in reasons if r])
+            self.assertEqual(list(result['reason_no']), [1] * len(result))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import os
+import pandas as pd
+from src.epftools.report_plan import ReportPlan
+from src.epftools.source_registry import SourceRegistry
+from src.epftools.daily_reporter import load_claim_csv
+
+class TestReportPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_report_plan"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.claim_path = os.path.join(self.test_dir, "Claim.csv")
+        pd.DataFrame({
+            'CLAIM ID': range(6),
+            'TASK ID': [10101, 10101, 10102, 10201, 11001, 11001],
+            'PENDING DAYS': [0, 5, 25, 30, 12, 150],
+            'STATUS': ['Pending at DA Accounts', 'Pending at DA Accounts', 'Pending at SS/AO/AC Accounts',
+                       'Pending at DA Accounts [EDIT]', 'Pending at Dispatch', 'Pending at DA Accounts'],
+        }).to_csv(self.claim_path, index=False)
+        self.registry = SourceRegistry()
+        self.registry.register('claim', self.claim_path, load_claim_csv)
+        self.tables = [
+            {'name': 'by_bin', 'source': 'claim', 'bins': 2, 'index': ['cat']},
+            {'name': 'by_status', 'source': 'claim', 'min_days': 0, 'index': ['STATUS']},
+            {'name': 'by_status_20', 'source': 'claim', 'min_days': 20, 'index': ['STATUS']},
+            {'name': 'da_wise', 'source': 'claim', 'min_days': 0, 'status': ['DA(Includes NTE)'], 'bins': 4,
+             'index': ['GROUP ID', 'TASK ID'], 'columns': ['cat']},
+            {'name': 'by_bin_again', 'source': 'claim', 'bins': 2, 'index': ['cat']},
+        ]
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_shared_work(self):
+        plan = ReportPlan(self.tables)
+        pivots = plan.execute(self.registry)
+        self.assertEqual(plan.stats['loads'], 1)
+        self.assertEqual(plan.stats['conditions'], 3)
+        self.assertEqual(plan.stats['binnings'], 2)
+        self.assertEqual(plan.stats['pivots'], 4)
+        self.assertIs(pivots['by_bin'], pivots['by_bin_again'])
+
+    def test_pivots(self):
+        pivots = ReportPlan(self.tables).execute(self.registry)
+        self.assertEqual(pivots['by_bin'].loc['Upto 20 Days', ('All', '')], 3)
+        self.assertEqual(pivots['by_status'].loc['All', ('All', '')], 5)
+        self.assertEqual(pivots['by_status_20'].loc['DA(Includes NTE)', ('All', '')], 2)
+        self.assertEqual(pivots['da_wise'].loc[(101, 10101), '<=10 Days'], 1)
+        self.assertEqual(pivots['da_wise'].loc[(110, 11001), '>10 Days'], 1)
+
+    def test_from_yaml(self):
+        path = os.path.join(self.test_dir, "report.yaml")
+        with open(path, "w") as f:
+            f.write("tables:\n"
+                    "  - name: by_status\n"
+                    "    source: claim\n"
+                    "    min_days: 20\n"
+                    "    index: [STATUS]\n")
+        plan = ReportPlan.from_yaml(path)
+        self.assertEqual(plan.tables[0]['columns'], ('Officer', 'GROUP ID'))
+        self.assertEqual(plan.execute(self.registry)['by_status'].loc['All', ('All', '')], 3)
+
+    def test_invalid_spec(self):
+        with self.assertRaises(ValueError):
+            ReportPlan([{'name': 'no_source'}])
+        with self.assertRaises(ValueError):
+            ReportPlan([{'name': 'x', 'source': 'claim', 'bins': 9}])
+
+if __name__ == '__main__':
+    unittest.main()
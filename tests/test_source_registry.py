@@ -0,0 +1,109 @@
+import unittest
+import os
+import pandas as pd
+from unittest.mock import patch
+from src.epftools.source_registry import SourceRegistry
+from src.epftools.daily_reporter import load_claim_csv, load_change_excel, STATUS_BINS
+
+class TestSourceRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_source_registry"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.claim_path = os.path.join(self.test_dir, "Claim.csv")
+        pd.DataFrame({
+            'CLAIM ID': [1, 2], 'TASK ID': [10101, None], 'PENDING DAYS': [5, 25],
+            'STATUS': ['Pending at DA Accounts', 'Pending at Dispatch'],
+        }).to_csv(self.claim_path, index=False)
+        self.online_path = os.path.join(self.test_dir, "online.xlsx")
+        with pd.ExcelWriter(self.online_path) as writer:
+            pd.DataFrame([['Online change pendency report']]).to_excel(writer, index=False, header=False)
+            pd.DataFrame({
+                'MEMBER ID': ['M1', 'M2'], 'PENDING DAYS': [5, 10],
+                'A/C GROUP': ['PYKRP110', 'PYKRP1XY'], 'DESIGNATION': ['RPFC', 'APFC'],
+            }).to_excel(writer, index=False, startrow=1)
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_loads_once(self):
+        calls = []
+
+        def loader(path):
+            calls.append(path)
+            return pd.read_csv(path)
+
+        registry = SourceRegistry()
+        registry.register('claim', self.claim_path, loader)
+        self.assertIs(registry.get('claim'), registry.get('claim'))
+        self.assertEqual(len(calls), 1)
+        with self.assertRaises(KeyError):
+            registry.get('tin')
+
+    def test_load_all_concurrent(self):
+        registry = SourceRegistry()
+        registry.register('claim', self.claim_path, load_claim_csv)
+        registry.register('online', self.online_path, load_change_excel)
+        frames = registry.load_all(max_workers=2)
+        self.assertEqual(set(registry.load_times), {'claim', 'online'})
+        self.assertEqual(list(frames['claim']['TASK ID']), [10101, 10100])
+        self.assertEqual(list(frames['claim']['STATUS']), ['DA(Includes NTE)', 'Dispatch/Cash/Scroll'])
+        # title row above the header is skipped, unparseable groups fall back to 100
+        self.assertEqual(list(frames['online']['GROUP ID']), [110, 100])
+        self.assertEqual(frames['online']['Officer'].iloc[0], 'GM')
+        self.assertTrue(pd.isna(frames['online']['Officer'].iloc[1]))
+
+    def test_sidecar_cache(self):
+        cache_dir = os.path.join(self.test_dir, "TEMP")
+        registry = SourceRegistry(cache_dir=cache_dir)
+        registry.register('online', self.online_path, load_change_excel)
+        first = registry.get('online')
+        self.assertNotIn('online', registry.cached)
+        self.assertTrue(os.path.exists(os.path.join(cache_dir, "online.xlsx.parquet")))
+
+        rerun = SourceRegistry(cache_dir=cache_dir)
+        rerun.register('online', self.online_path, load_change_excel)
+        with patch('src.epftools.daily_reporter.pd.read_excel') as read_excel:
+            pd.testing.assert_frame_equal(rerun.get('online'), first)
+            read_excel.assert_not_called()
+        self.assertIn('online', rerun.cached)
+
+        # same content downloaded again: new mtime, same hash
+        os.utime(self.online_path, ns=(0, 10**18))
+        touched = SourceRegistry(cache_dir=cache_dir)
+        touched.register('online', self.online_path, load_change_excel)
+        touched.load_all()
+        self.assertIn('online', touched.cached)
+
+        pd.DataFrame({'MEMBER ID': ['M9'], 'PENDING DAYS': [1], 'A/C GROUP': [101],
+                      'DESIGNATION': ['RPFC']}).to_excel(self.online_path, index=False)
+        changed = SourceRegistry(cache_dir=cache_dir)
+        changed.register('online', self.online_path, load_change_excel)
+        self.assertEqual(list(changed.get('online')['MEMBER ID']), ['M9'])
+        self.assertNotIn('online', changed.cached)
+
+    def test_sidecar_rebuilt_when_bins_change(self):
+        cache_dir = os.path.join(self.test_dir, "TEMP")
+        registry = SourceRegistry(cache_dir=cache_dir)
+        registry.register('claim', self.claim_path, load_claim_csv)
+        registry.get('claim')
+        with patch.dict(STATUS_BINS, {'Pending at Dispatch': 'Dispatch'}):
+            rerun = SourceRegistry(cache_dir=cache_dir)
+            rerun.register('claim', self.claim_path, load_claim_csv)
+            self.assertEqual(list(rerun.get('claim')['STATUS']), ['DA(Includes NTE)', 'Dispatch'])
+            self.assertNotIn('claim', rerun.cached)
+        again = SourceRegistry(cache_dir=cache_dir)
+        again.register('claim', self.claim_path, load_claim_csv)
+        self.assertEqual(list(again.get('claim')['STATUS']), ['DA(Includes NTE)', 'Dispatch/Cash/Scroll'])
+
+    def test_missing_file(self):
+        registry = SourceRegistry()
+        registry.register('claim', os.path.join(self.test_dir, "missing.csv"), load_claim_csv)
+        registry.register('online', self.online_path, load_change_excel)
+        with self.assertRaises(FileNotFoundError):
+            registry.load_all()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.epftools.visualization import lttb_downsample, minmax_downsample, top_establishments, plot_establishment_trends
+from src.epftools.estmst_analyzer import EstmstAnalyzer
+
+class TestVisualization(unittest.TestCase):
+
+    def setUp(self):
+        dates = pd.date_range('2016-01-01', periods=96, freq='MS')
+        rng = np.random.default_rng(0)
+        rows = []
+        for i in range(10):
+            members = (i + 1) * 100 + rng.integers(0, 50, size=96)
+            rows.append(pd.DataFrame({'EST ID': f'EST{i}', 'date': dates, 'AMOUNT': members * 1000,
+                                      'ECR': 1, 'MEMBER': members}))
+        self.df = pd.concat(rows, ignore_index=True)
+        self.cube = EstmstAnalyzer().to_cube(self.df)
+
+    def test_lttb_keeps_ends_and_peak(self):
+        y = np.zeros(1000)
+        y[500] = 100
+        keep = lttb_downsample(np.arange(1000), y, 50)
+        self.assertEqual(len(keep), 50)
+        self.assertEqual((keep[0], keep[-1]), (0, 999))
+        self.assertIn(500, keep)
+        self.assertTrue((np.diff(keep) > 0).all())
+        np.testing.assert_array_equal(lttb_downsample(np.arange(10), np.arange(10), 50), np.arange(10))
+
+    def test_minmax_keeps_extremes(self):
+        y = np.sin(np.linspace(0, 20, 1000))
+        keep = minmax_downsample(y, 40)
+        self.assertLessEqual(len(keep), 40)
+        self.assertIn(y.argmax(), keep)
+        self.assertIn(y.argmin(), keep)
+        for n_out in (2, 3):
+            self.assertEqual(len(minmax_downsample(y, n_out)), n_out)
+        spike = np.zeros(100)
+        spike[40] = 5
+        np.testing.assert_array_equal(minmax_downsample(spike, 3), [0, 40, 99])
+
+    def test_top_establishments(self):
+        self.assertEqual(top_establishments(self.cube, 'MEMBER', 3), ['EST9', 'EST8', 'EST7'])
+        self.assertEqual(top_establishments(self.cube, 'MEMBER', 1, by='mean'), ['EST9'])
+
+    def test_plot_respects_point_budget(self):
+        fig = plot_establishment_trends(self.df, metric='MEMBER', top_n=4, max_points=100)
+        self.assertEqual(len(fig.data), 4)
+        self.assertEqual(fig.data[0].type, 'scattergl')
+        self.assertLessEqual(sum(len(trace.x) for trace in fig.data), 100)
+        fig = plot_establishment_trends(self.cube, est_ids=['EST0'], method='minmax', max_points=30)
+        self.assertLessEqual(len(fig.data[0].x), 30)
+
+    def test_plot_caps_series_to_budget(self):
+        for method in ('lttb', 'minmax'):
+            fig = plot_establishment_trends(self.cube, metric='MEMBER', top_n=50, max_points=12, method=method)
+            self.assertEqual(len(fig.data), 4)
+            self.assertLessEqual(sum(len(trace.x) for trace in fig.data), 12)
+        with self.assertRaises(ValueError):
+            plot_establishment_trends(self.cube, est_ids=['EST0', 'EST1', 'EST2', 'EST3', 'EST4'], max_points=12)
+
+if __name__ == '__main__':
+    unittest.main()
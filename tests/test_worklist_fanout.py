@@ -0,0 +1,85 @@
+import unittest
+import os
+import sys
+import pandas as pd
+from src.epftools.pdf_render_pool import PDFRenderPool
+from src.epftools.worklist_fanout import WorklistFanout
+
+STUB_RENDERER = """
+import sys
+html = sys.stdin.read()
+if '10201' in html:
+    sys.stderr.write('stub render error')
+    sys.exit(1)
+with open(sys.argv[-1], 'w') as f:
+    f.write(html)
+"""
+
+class TestWorklistFanout(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_worklist_fanout"
+        os.makedirs(self.test_dir, exist_ok=True)
+        stub = os.path.join(self.test_dir, "stub_renderer.py")
+        with open(stub, "w") as f:
+            f.write(STUB_RENDERER)
+        self.pool = PDFRenderPool([sys.executable, stub], max_workers=2)
+        self.output_dir = os.path.join(self.test_dir, "out")
+        self.listing = pd.DataFrame({
+            'CLAIM ID': range(5),
+            'TASK ID': [10102, 10101, 10102, 10201, 10101],
+            'GROUP ID': [101, 101, 101, 102, 101],
+            'PENDING DAYS': [25, 30, 40, 21, 50],
+        })
+
+    def tearDown(self):
+        import shutil
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_fan_out_by_task(self):
+        fanout = WorklistFanout(self.output_dir, render_pool=self.pool, max_workers=2)
+        manifest = fanout.run(self.listing, by='TASK ID', title='Claims > 20 days')
+        self.assertEqual(manifest['TASK ID'].tolist(), [10101, 10102, 10201])
+        self.assertEqual(manifest['rows'].tolist(), [2, 2, 1])
+        self.assertEqual(manifest['ok'].tolist(), [True, True, False])
+        self.assertIn('stub render error', manifest['error'][2])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'manifest.csv')))
+        worklist = pd.read_excel(os.path.join(self.output_dir, 'Claims_20_days_10101.xlsx'))
+        self.assertEqual(worklist['CLAIM ID'].tolist(), [4, 1])
+        with open(manifest['pdf'][1]) as f:
+            html = f.read()
+        self.assertIn('Claims &gt; 20 days - TASK ID 10102', html)
+        self.assertLess(html.index('<td>2</td>'), html.index('<td>0</td>'))
+
+    def test_fan_out_by_group_xlsx_only(self):
+        fanout = WorklistFanout(self.output_dir, max_workers=2)
+        manifest = fanout.run(self.listing, by='GROUP ID', formats=('xlsx',), prefix='pending')
+        self.assertEqual(manifest['rows'].tolist(), [4, 1])
+        self.assertTrue(manifest['pdf'].isna().all())
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'pending_102.xlsx')))
+
+    def test_missing_keys_get_a_blank_worklist(self):
+        listing = self.listing.assign(**{'GROUP ID': pd.array([101, pd.NA, 102, pd.NA, 101], dtype='Int64')})
+        fanout = WorklistFanout(self.output_dir, max_workers=2)
+        manifest = fanout.run(listing, by='GROUP ID', formats=('xlsx',), prefix='pending')
+        self.assertEqual(manifest['rows'].sum(), 5)
+        self.assertEqual(manifest['GROUP ID'].dropna().tolist(), [101, 102])
+        self.assertEqual(str(manifest['GROUP ID'].dtype), 'Int64')
+        blank = manifest[manifest['GROUP ID'].isna()].iloc[0]
+        self.assertEqual((blank['rows'], os.path.basename(blank['xlsx'])), (2, 'pending_blank.xlsx'))
+        self.assertEqual(pd.read_excel(blank['xlsx'])['CLAIM ID'].tolist(), [1, 3])
+
+    def test_clashing_keys_get_separate_files(self):
+        listing = self.listing.assign(**{'TASK ID': ['a/b', 'a_b', 'a/b', 'A:B', 'x[1]']})
+        fanout = WorklistFanout(self.output_dir, max_workers=2)
+        manifest = fanout.run(listing, by='TASK ID', formats=('xlsx',), prefix='pending')
+        self.assertTrue(manifest['ok'].all())
+        self.assertEqual(manifest['xlsx'].nunique(), 4)
+        self.assertEqual(sorted(os.path.basename(p) for p in manifest['xlsx']),
+                         ['pending_A_B.xlsx', 'pending_a_b_2.xlsx', 'pending_a_b_3.xlsx', 'pending_x_1.xlsx'])
+        with pd.ExcelFile(manifest['xlsx'][manifest['TASK ID'] == 'x[1]'].iloc[0]) as book:
+            self.assertEqual(book.sheet_names, ['x 1'])
+
+if __name__ == '__main__':
+    unittest.main()